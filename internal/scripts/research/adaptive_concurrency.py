@@ -0,0 +1,215 @@
+"""Per-host concurrency that adapts to how the host responds (AIMD).
+
+Each host gets a limit on requests in flight. A limit starts in slow start:
+it grows by one per success, which doubles it every round trip. After the
+first throttle it grows by one per round trip instead. A 429, a 5xx or a
+dropped connection cuts it by `1 - decrease`, once per round trip, however
+many requests were in flight when the host pushed back. The cut is gentler
+than TCP's halving so the limit stays closer to what the host can take.
+Growth pauses while latency stays above `latency_tolerance` times the
+fastest response seen, because a host that is queueing will not get faster
+with more requests. It also pauses while the limit is not what holds
+requests back, for instance while the client's rate limit is the
+bottleneck, so the limit only grows on evidence that the host can take
+more. The limit always stays within `[minimum, maximum]`.
+
+A slot is taken after the client's rate limit has let a request through
+and right before it is sent, so it measures the host and not the queue in
+front of it.
+
+Throttled requests are re-queued instead of dropped. They wait out their
+backoff (or `Retry-After`) without holding a slot, then queue for one again,
+up to `max_attempts` tries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+
+from http_cache import OfflineCacheMiss
+from http_client import RETRY_STATUSES, HttpClient, backoff_delay, parse_retry_after
+from instrumentation import METRICS
+
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 64
+MAX_ATTEMPTS = 8
+DECREASE_FACTOR = 0.7
+LATENCY_TOLERANCE = 2.0
+# Weight of the newest sample in the latency moving average.
+LATENCY_SMOOTHING = 0.2
+
+OK, THROTTLED, FAILED = "ok", "throttled", "failed"
+
+
+class HostLimit:
+    """The AIMD limit of one host; `acquire` blocks while the host is at its limit."""
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+        decrease: float = DECREASE_FACTOR,
+        latency_tolerance: float = LATENCY_TOLERANCE,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.slow_start = True
+        self.in_flight = 0
+        self.waiting = 0
+        self.latency: float | None = None
+        self.baseline: float | None = None
+        self.peak = self.limit
+        self.requests = 0
+        self.throttled = 0
+        self.decreases = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            self.waiting += 1
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self, outcome: str, seconds: float | None = None) -> None:
+        """Give the slot back. `seconds` is how long the request took, if it was measured."""
+        with self._cond:
+            # Only a limit that was full, or had requests queued for it, held anything back.
+            saturated = self.waiting > 0 or self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self.requests += 1
+            if outcome == THROTTLED:
+                self.throttled += 1
+                self._back_off(seconds)
+            elif outcome == OK and seconds:
+                self._grow(seconds, saturated)
+            self._cond.notify_all()
+
+    def _back_off(self, seconds: float | None) -> None:
+        # Requests already in flight when the host pushed back report the same
+        # congestion, so the limit is cut at most once per round trip. Before
+        # any success, the throttled request's own time stands in for the round trip.
+        if self.latency is None and seconds:
+            self.latency = seconds
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self.slow_start = False
+        self.limit = max(float(self.minimum), self.limit * self.decrease)
+        self.decreases += 1
+
+    def _grow(self, seconds: float, saturated: bool) -> None:
+        self.latency = seconds if self.latency is None else self.latency + LATENCY_SMOOTHING * (seconds - self.latency)
+        self.baseline = seconds if self.baseline is None else min(self.baseline, seconds)
+        if self.latency > self.baseline * self.latency_tolerance:
+            self.slow_start = False
+            return
+        if not saturated:
+            return
+        # One more per success doubles the limit each round trip; 1/limit adds one per round trip.
+        self.limit = min(float(self.maximum), self.limit + (1.0 if self.slow_start else 1.0 / self.limit))
+        self.peak = max(self.peak, self.limit)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "peak_limit": round(self.peak, 2),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "decreases": self.decreases,
+                "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+                "baseline_ms": round(self.baseline * 1000, 1) if self.baseline is not None else None,
+            }
+
+
+class AdaptiveLimiter:
+    """A `HostLimit` per host, and GETs that wait for a slot and re-queue throttled attempts."""
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> None:
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_attempts = max(1, max_attempts)
+        self._hosts: dict[str, HostLimit] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostLimit:
+        name = urlparse(url).netloc.lower()
+        with self._lock:
+            limit = self._hosts.get(name)
+            if limit is None:
+                limit = self._hosts[name] = HostLimit(self.initial, self.minimum, self.maximum)
+            return limit
+
+    def get(self, client: HttpClient, url: str) -> requests.Response:
+        """`client.get(url)` under the host's limit.
+
+        Returns the first response that is not a 429/5xx, or the last one
+        once `max_attempts` are used up. Raises the last connection error if
+        every attempt failed to connect. The client's own retries are turned
+        off so that every throttle reaches the limit.
+        """
+        limit = self.host(url)
+        attempt = 0
+        while True:
+            error: requests.RequestException | None = None
+            response: requests.Response | None = None
+            sent_at: float | None = None
+            outcome = FAILED
+
+            def take_slot() -> None:
+                nonlocal sent_at
+                limit.acquire()
+                sent_at = time.perf_counter()
+
+            try:
+                response = client.get(url, max_retries=0, before_send=take_slot)
+            except OfflineCacheMiss:
+                raise
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error, outcome = exc, THROTTLED
+            else:
+                outcome = THROTTLED if response.status_code in RETRY_STATUSES else OK
+            finally:
+                # Cache hits never take a slot and say nothing about the host.
+                if sent_at is not None:
+                    limit.release(outcome, time.perf_counter() - sent_at)
+
+            if outcome != THROTTLED:
+                return response
+            attempt += 1
+            if attempt >= self.max_attempts:
+                METRICS.incr("adaptive.gave_up")
+                if error is not None:
+                    raise error
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+            if response is not None:
+                response.close()
+            METRICS.incr("adaptive.requeued")
+            time.sleep(backoff_delay(attempt - 1, retry_after))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {name: limit.stats() for name, limit in sorted(hosts.items())}
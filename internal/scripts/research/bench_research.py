@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for the research corpus parsers and selectors.
+
+Every case runs against the payloads in `fixtures/`, so timings do not
+depend on the network. The committed fixtures are small hand-written
+samples shaped like each source's responses (the Toss article is about
+2 KB), not captured pages. The suite is synthetic: it compares one change
+against another on the same inputs, and does not predict timings on
+production documents. `--record` replaces the samples with live captures
+for that. Record-level cases are scaled synthetically from the fixture
+records.
+
+Results can be saved as a baseline and checked against it later to catch
+regressions. Baselines depend on the machine, so none is committed.
+`--check` without a baseline reports that and passes.
+
+`--verify` instead runs the randomized equivalence checks in
+`equivalence.py`, which compare the optimized selection, extraction and
+normalization paths with the implementations they replaced.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from build_nekaracuba_corpus import (
+    SOURCES,
+    Record,
+    baemin_page_url,
+    dedupe_records,
+    extract_line_links,
+    infer_topic,
+    parse_baemin_page,
+    parse_coupang_feed,
+    parse_kakao_contents,
+    parse_line_listing,
+    parse_naver_feed,
+    select_records,
+    sort_records,
+)
+from equivalence import DEFAULT_ROUNDS, format_checks, run_checks
+from generate_toss_analysis import analyse_article
+from html_extract import etree, extract_page
+from http_client import HttpClient
+from jsonl_sink import write_text_atomic
+from normalize import normalize_url, to_iso_datetime, tokenize
+from tokenizer import TOKENIZERS, get_tokenizer
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+BASELINE = FIXTURE_DIR / "bench-baseline.json"
+
+DEFAULT_SCALE = 10_000
+DEFAULT_REPEAT = 200
+BATCH_REPEAT = 5
+REGRESSION_THRESHOLD = 0.25
+
+FIXTURE_SOURCES = {
+    "d2.atom.xml": "https://d2.naver.com/d2.atom",
+    "coupang-medium.rss.xml": "https://medium.com/feed/coupang-engineering",
+    "kakao-contents.json": "https://if.kakao.com/api/v1/contents",
+    "kakao-event.json": "https://if.kakao.com/api/v1/events/2025",
+    "line-listing.html": "https://engineering.linecorp.com/en/blog/",
+    "woowahan-posts.json": baemin_page_url(1),
+    "toss-article.html": "https://toss.tech/article/rethinking-design-system",
+}
+
+
+@dataclass
+class BenchResult:
+    name: str
+    items: int
+    runs: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_kib: float
+
+
+@dataclass
+class Fixtures:
+    d2_atom: str
+    coupang_rss: str
+    kakao: tuple[Any, Any]
+    line_html: str
+    woowahan_posts: list[dict[str, Any]]
+    toss_html: str
+
+    @classmethod
+    def load(cls, directory: Path = FIXTURE_DIR) -> Fixtures:
+        def read(name: str) -> str:
+            return (directory / name).read_text(encoding="utf-8")
+
+        return cls(
+            d2_atom=read("d2.atom.xml"),
+            coupang_rss=read("coupang-medium.rss.xml"),
+            kakao=(json.loads(read("kakao-contents.json")), json.loads(read("kakao-event.json"))),
+            line_html=read("line-listing.html"),
+            woowahan_posts=json.loads(read("woowahan-posts.json")),
+            toss_html=read("toss-article.html"),
+        )
+
+    def records(self) -> list[Record]:
+        return [
+            *parse_naver_feed(FIXTURE_SOURCES["d2.atom.xml"], self.d2_atom),
+            *parse_kakao_contents(FIXTURE_SOURCES["kakao-contents.json"], self.kakao),
+            *parse_line_listing(FIXTURE_SOURCES["line-listing.html"], self.line_html),
+            *parse_coupang_feed(FIXTURE_SOURCES["coupang-medium.rss.xml"], self.coupang_rss),
+            *parse_baemin_page(FIXTURE_SOURCES["woowahan-posts.json"], self.woowahan_posts),
+        ]
+
+
+def synthetic_records(seed: list[Record], count: int) -> list[Record]:
+    """Scale fixture records to `count`, with roughly one in ten links repeated."""
+    records: list[Record] = []
+    for i in range(count):
+        base = seed[i % len(seed)]
+        variant = i - i % 10 if i % 10 == 9 else i
+        records.append(
+            replace(
+                base,
+                link=f"{base.link}-{variant}",
+                date=f"{2020 + i % 6}-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00+00:00",
+                title=f"{base.title} {i}",
+            )
+        )
+    return records
+
+
+def synthetic_urls(seed: list[Record], count: int) -> list[str]:
+    shapes = ("{}", "{}/", "{}?utm_source=rss", "{}//", "{}#top")
+    urls: list[str] = []
+    for i in range(count):
+        link = seed[i % len(seed)].link.replace("https://", "HTTPS://" if i % 7 == 0 else "https://")
+        urls.append(shapes[i % len(shapes)].format(f"{link}-{i}"))
+    return urls
+
+
+def synthetic_dates(count: int) -> list[str]:
+    shapes = (
+        "{:%Y-%m-%dT%H:%M:%SZ}",
+        "{:%Y-%m-%dT%H:%M:%S+09:00}",
+        "{:%Y-%m-%dT%H:%M:%S}",
+        "{:%a, %d %b %Y %H:%M:%S GMT}",
+        "{:%a, %d %b %Y %H:%M:%S +0900}",
+    )
+    start = datetime(2020, 1, 1)
+    return [shapes[i % len(shapes)].format(start + timedelta(hours=i)) for i in range(count)]
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def peak_memory(call: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def summarize(name: str, items: int, latencies_ns: list[int], peak_kib: float) -> BenchResult:
+    latencies = sorted(value / 1e6 for value in latencies_ns)
+    total_s = sum(latencies) / 1000
+    return BenchResult(
+        name=name,
+        items=items,
+        runs=len(latencies),
+        throughput=items * len(latencies) / total_s if total_s else 0.0,
+        p50_ms=percentile(latencies, 0.50),
+        p95_ms=percentile(latencies, 0.95),
+        p99_ms=percentile(latencies, 0.99),
+        peak_kib=peak_kib,
+    )
+
+
+def bench_each(name: str, fn: Callable[[Any], object], inputs: Sequence[Any]) -> BenchResult:
+    """Time `fn` once per input; latency percentiles are per call."""
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    for value in inputs:
+        start = clock()
+        fn(value)
+        latencies.append(clock() - start)
+    peak = peak_memory(lambda: [fn(value) for value in inputs[:1000]])
+    return summarize(name, 1, latencies, peak)
+
+
+def bench_batch(
+    name: str,
+    fn: Callable[[Any], object],
+    setup: Callable[[], Any],
+    items: int,
+    repeat: int,
+) -> BenchResult:
+    """Time whole-batch calls on a fresh `setup()` input each; throughput counts `items` per call.
+
+    The setup is untimed, so in-place operations get an unmodified input every run.
+    """
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        value = setup()
+        start = clock()
+        fn(value)
+        latencies.append(clock() - start)
+    value = setup()
+    return summarize(name, items, latencies, peak_memory(lambda: fn(value)))
+
+
+def run_cases(fixtures: Fixtures, scale: int, repeat: int, only: Iterable[str] = ()) -> list[BenchResult]:
+    seed = fixtures.records()
+    records = synthetic_records(seed, scale)
+    company_map: dict[str, list[Record]] = {company: [] for company in SOURCES.companies()}
+    for record in sort_records(dedupe_records(list(records))):
+        company_map[record.company].append(record)
+    article_chunks = extract_page(fixtures.toss_html).chunks
+    chunks = [article_chunks[i % len(article_chunks)] for i in range(scale)]
+    topics = [(record.title, record.tags) for record in records]
+
+    parsers = ["stdlib", "bs4", *(["lxml"] if etree is not None else [])]
+    cases: list[tuple[str, Callable[[], BenchResult]]] = [
+        ("normalize_url", lambda: bench_each("normalize_url", normalize_url, synthetic_urls(seed, scale))),
+        ("to_iso_datetime", lambda: bench_each("to_iso_datetime", to_iso_datetime, synthetic_dates(scale))),
+        ("infer_topic", lambda: bench_each("infer_topic", lambda pair: infer_topic(*pair), topics)),
+        ("tokenize", lambda: bench_each("tokenize", tokenize, chunks)),
+        *(
+            (
+                f"tokenizer[{name}]",
+                lambda name=name: bench_each(f"tokenizer[{name}]", get_tokenizer(name).terms, chunks),
+            )
+            for name in TOKENIZERS
+        ),
+        (
+            "extract_line_links",
+            lambda: bench_each("extract_line_links", lambda html: extract_line_links(html, "en"), [fixtures.line_html] * repeat),
+        ),
+        (
+            "parse_naver_feed",
+            lambda: bench_each(
+                "parse_naver_feed",
+                lambda text: parse_naver_feed(FIXTURE_SOURCES["d2.atom.xml"], text),
+                [fixtures.d2_atom] * repeat,
+            ),
+        ),
+        (
+            "parse_coupang_feed",
+            lambda: bench_each(
+                "parse_coupang_feed",
+                lambda text: parse_coupang_feed(FIXTURE_SOURCES["coupang-medium.rss.xml"], text),
+                [fixtures.coupang_rss] * repeat,
+            ),
+        ),
+        (
+            "parse_kakao_contents",
+            lambda: bench_each(
+                "parse_kakao_contents",
+                lambda payload: parse_kakao_contents(FIXTURE_SOURCES["kakao-contents.json"], payload),
+                [fixtures.kakao] * repeat,
+            ),
+        ),
+        (
+            "parse_baemin_page",
+            lambda: bench_each(
+                "parse_baemin_page",
+                lambda data: parse_baemin_page(FIXTURE_SOURCES["woowahan-posts.json"], data),
+                [fixtures.woowahan_posts] * repeat,
+            ),
+        ),
+        *(
+            (
+                f"analyse_article[{parser}]",
+                lambda parser=parser: bench_each(
+                    f"analyse_article[{parser}]",
+                    lambda html: analyse_article(FIXTURE_SOURCES["toss-article.html"], html, parser=parser),
+                    [fixtures.toss_html] * repeat,
+                ),
+            )
+            for parser in parsers
+        ),
+        (
+            f"dedupe_records[{scale}]",
+            lambda: bench_batch(
+                f"dedupe_records[{scale}]", dedupe_records, lambda: list(records), scale, BATCH_REPEAT
+            ),
+        ),
+        (
+            f"sort_records[{scale}]",
+            lambda: bench_batch(f"sort_records[{scale}]", sort_records, lambda: list(records), scale, BATCH_REPEAT),
+        ),
+        (
+            f"select_records[{scale}]",
+            lambda: bench_batch(
+                f"select_records[{scale}]", select_records, lambda: company_map, scale, BATCH_REPEAT
+            ),
+        ),
+    ]
+
+    filters = list(only)
+    results: list[BenchResult] = []
+    for name, case in cases:
+        if filters and not any(pattern in name for pattern in filters):
+            continue
+        results.append(case())
+    return results
+
+
+def format_results(results: list[BenchResult]) -> str:
+    lines = [
+        f"{'case':<28} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9}",
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<28} {result.throughput:>12,.0f} {result.p50_ms:>9.3f} "
+            f"{result.p95_ms:>9.3f} {result.p99_ms:>9.3f} {result.peak_kib:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(results: list[BenchResult], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return one message per case whose throughput fell more than `threshold` below the baseline."""
+    previous = {row["name"]: row for row in baseline.get("results", [])}
+    regressions: list[str] = []
+    for result in results:
+        before = previous.get(result.name)
+        if not before or not before["throughput"]:
+            continue
+        change = result.throughput / before["throughput"] - 1
+        if change < -threshold:
+            regressions.append(
+                f"{result.name}: {before['throughput']:,.0f} -> {result.throughput:,.0f} items/s ({change:+.0%})"
+            )
+    return regressions
+
+
+def record_fixtures(directory: Path = FIXTURE_DIR) -> None:
+    with HttpClient() as client:
+        for name, url in FIXTURE_SOURCES.items():
+            write_text_atomic(directory / name, client.get_text(url))
+            print(f"recorded {name} <- {url}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=DEFAULT_SCALE, help="records for the record-level cases")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="calls per fixture-payload case")
+    parser.add_argument("--only", action="append", default=[], help="run cases whose name contains this (repeatable)")
+    parser.add_argument("--json", type=Path, help="also write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit non-zero if a case regressed past --threshold; skipped when there is no baseline",
+    )
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="replace the sample fixtures with captures from the live sources and exit",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="run the randomized equivalence checks instead of timing; --only filters them too",
+    )
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="random cases per equivalence check")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the equivalence checks")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.record:
+        record_fixtures()
+        return 0
+    if args.verify:
+        checks = run_checks(args.rounds, args.seed, args.only)
+        print(format_checks(checks))
+        return 0 if all(check.ok for check in checks) else 1
+
+    results = run_cases(Fixtures.load(), args.scale, args.repeat, args.only)
+    print(format_results(results))
+
+    report = {"scale": args.scale, "repeat": args.repeat, "results": [asdict(result) for result in results]}
+    if args.json:
+        write_text_atomic(args.json, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    if args.save_baseline:
+        write_text_atomic(args.baseline, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; skipping the regression check (save one with --save-baseline)")
+            return 0
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("scale") != args.scale:
+            print(f"baseline was taken at --scale {baseline.get('scale')}; comparing anyway", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
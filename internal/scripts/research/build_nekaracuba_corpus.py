@@ -3,30 +3,84 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import re
+import sys
+import time
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
+from functools import partial
+from operator import attrgetter, itemgetter
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse, urlunparse
+from typing import Any, Callable, Collection, Iterable, Iterator, Mapping
+from urllib.parse import urlparse
 from xml.etree import ElementTree as ET
 
 import requests
-from bs4 import BeautifulSoup
+
+from columnar import FORMATS, columnar_path, write_rows
+from crawl_state import CrawlState
+from fetch_engine import MAX_WORKERS, FetchEngine
+from generate_toss_analysis import (
+    CORPUS_DERIVED_COLUMNS,
+    CPU_WORKERS,
+    KEYWORDS as FULL_TEXT_CATEGORIES,
+    TOP_KEYWORDS,
+    analyse_pipeline,
+)
+from http_cache import add_cache_arguments, cache_from_args
+from html_extract import PARSERS
+from http_client import HttpClient, add_client_arguments
+from instrumentation import METRICS, add_instrumentation_arguments, profiling
+from jsonl_sink import COMPRESSIONS, JsonlSink, write_text_atomic
+from keyword_index import MATCHER, KeywordIndex, matcher_notice
+from near_dupes import THRESHOLD as NEAR_DUP_THRESHOLD, NearDuplicateIndex
+from normalize import EPOCH, normalize_url, to_iso_datetime
+from selection import QuotaSelector
+from snapshots import (
+    SnapshotDiff,
+    SnapshotSink,
+    SnapshotStore,
+    add_snapshot_arguments,
+    changes_path,
+    snapshot_store_from_args,
+)
+from tokenizer import TOKENIZERS
+from source_registry import SourceRegistry
 
 ROOT = Path(__file__).resolve().parents[2]
 OUT_JSONL = ROOT / "docs/research/benchmark/benchmark-nekaracuba-corpus-2026.jsonl"
 OUT_SUMMARY_MD = ROOT / "docs/research/benchmark/benchmark-nekaracuba-summary-2026.md"
+OUT_STATE = ROOT / "docs/research/benchmark/benchmark-nekaracuba-crawl-state.sqlite3"
+OUT_REPORT = ROOT / "docs/research/benchmark/benchmark-nekaracuba-run-report.json"
+OUT_CHANGES = changes_path(OUT_JSONL)
+SNAPSHOT_NAME = "nekaracuba"
+# Builds listed in the summary's coverage history.
+HISTORY_BUILDS = 10
 
 TARGET_COUNT = 100
 MIN_PER_COMPANY = 15
 TIMEOUT = 20
 USER_AGENT = "Mozilla/5.0 (compatible; eunu-log-corpus-bot/1.0)"
 
-COMPANY_ORDER = ["NAVER", "KAKAO", "LINE", "COUPANG", "BAEMIN"]
+LINE_PAGES = 12
+LINE_MODES = ("sitemap", "listing")
+# A sitemap (or RSS feed) lists every post in one request; a sitemap index is followed one level.
+LINE_DISCOVERY_URL = "https://engineering.linecorp.com/sitemap.xml"
+LINE_LOCALES = ("en", "ko")
+# Article pages fetched per run to fill in real titles, dates and tags of selected LINE posts.
+LINE_ENRICH_BUDGET = 40
+# Checkpoint name for enrichment pages, kept apart from the LINE source so its failures do not hold the source open.
+LINE_ARTICLES = "LINE-articles"
+BAEMIN_PAGES = 10
+WP_PAST_LAST_PAGE = "rest_post_invalid_page_number"
+# Pages an ordered source fetches at once; the next window is only requested
+# if selection keeps pulling from that source.
+PAGE_WINDOW = 4
 
 TOPIC_KEYWORDS = {
     "frontend": [
@@ -63,10 +117,15 @@ TOPIC_KEYWORDS = {
     ],
 }
 
-DEFAULT_HEADERS = {"User-Agent": USER_AGENT}
+TOPIC_INDEX = KeywordIndex(TOPIC_KEYWORDS)
+TOPICS = [*TOPIC_KEYWORDS, "other"]
+BALANCES = ("company", "topic")
 
+# Registration order is the order selection fills per-company quotas in.
+SOURCES = SourceRegistry()
 
-@dataclass
+
+@dataclass(slots=True)
 class Record:
     company: str
     source: str
@@ -76,64 +135,82 @@ class Record:
     topic: str
     tags: list[str]
     evidence: str
+    # Full-text analysis of the article body, filled for selected records by `analyse_full_text`.
+    pattern: str = ""
+    word_count: int = 0
+    category_scores: dict[str, int] = field(default_factory=dict)
+    top_keywords: list[str] = field(default_factory=list)
+    excerpt: str = ""
 
-
-def normalize_url(url: str) -> str:
-    parsed = urlparse(url.strip())
-    netloc = parsed.netloc.lower()
-    path = re.sub(r"/+", "/", parsed.path).rstrip("/")
-    if not path:
-        path = "/"
-    return urlunparse((parsed.scheme, netloc, path, "", "", ""))
-
-
-def to_iso_datetime(value: str | None) -> str:
-    if not value:
-        return "1970-01-01T00:00:00+00:00"
-    value = value.strip()
-    if not value:
-        return "1970-01-01T00:00:00+00:00"
-    try:
-        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).isoformat()
-    except ValueError:
-        pass
-    try:
-        dt = parsedate_to_datetime(value)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).isoformat()
-    except (TypeError, ValueError):
-        return "1970-01-01T00:00:00+00:00"
+    def __post_init__(self) -> None:
+        # A handful of distinct values repeated on every record; share one copy of each.
+        self.company = sys.intern(self.company)
+        self.source = sys.intern(self.source)
+        self.topic = sys.intern(self.topic)
 
 
 def infer_topic(title: str, tags: list[str]) -> str:
     haystack = f"{title} {' '.join(tags)}".lower()
-    scores: dict[str, int] = {}
-    for topic, keywords in TOPIC_KEYWORDS.items():
-        scores[topic] = sum(1 for kw in keywords if kw in haystack)
+    scores = TOPIC_INDEX.score(haystack)
     best_topic = max(scores, key=scores.get)
     if scores[best_topic] == 0:
         return "other"
     return best_topic
 
 
-def get_json(url: str) -> Any:
-    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+@dataclass
+class CrawlContext:
+    engine: FetchEngine
+    client: HttpClient
+    state: CrawlState
+    line_pages: int = LINE_PAGES
+    line_mode: str = "sitemap"
+    line_discovery_url: str = LINE_DISCOVERY_URL
+    baemin_pages: int = BAEMIN_PAGES
+
+
+def crawl_pages(
+    ctx: CrawlContext,
+    company: str,
+    urls: Iterable[str],
+    load: Callable[[str], Any],
+    parse: Callable[[str, Any], list[Record]],
+    window: int | None = None,
+) -> Iterator[list[Record]]:
+    """Fetch and parse pages in parallel, checkpointing each page's records.
+
+    Pages are yielded in URL order. With a `window`, only that many pages are
+    in flight at a time and the next batch waits until the caller asks for it.
+    A `load` that returns None marks the page as failed: it is parsed as usual
+    but recorded as a failure rather than checkpointed, so a resume retries it.
+    """
 
+    def crawl(url: str) -> list[Record]:
+        saved = ctx.state.load_page(company, url)
+        if saved is not None:
+            METRICS.incr("pages.resumed")
+            return [Record(**row) for row in saved]
+        with METRICS.timer("sources", company):
+            payload = load(url)
+        with METRICS.timer("parse", company):
+            records = parse(url, payload)
+        if payload is None:
+            METRICS.incr("pages.failed")
+            ctx.state.record_failure(company, url)
+            return records
+        METRICS.incr("pages.fetched")
+        METRICS.incr(f"records.{company}", len(records))
+        ctx.state.save_page(company, url, [asdict(record) for record in records])
+        return records
 
-def get_text(url: str) -> str:
-    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=TIMEOUT)
-    response.raise_for_status()
-    return response.text
+    urls = iter(urls)
+    while batch := list(islice(urls, window)) if window else list(urls):
+        yield from ctx.engine.map(crawl, batch)
+        if not window:
+            return
 
 
-def fetch_naver_records() -> list[Record]:
-    xml_text = get_text("https://d2.naver.com/d2.atom")
+def parse_naver_feed(url: str, xml_text: str) -> list[Record]:
     root = ET.fromstring(xml_text)
     ns = {"atom": "http://www.w3.org/2005/Atom"}
     records: list[Record] = []
@@ -163,10 +240,18 @@ def fetch_naver_records() -> list[Record]:
     return records
 
 
-def fetch_kakao_records() -> list[Record]:
-    contents = get_json("https://if.kakao.com/api/v1/contents")
-    event = get_json("https://if.kakao.com/api/v1/events/2025")
+@SOURCES.register("NAVER")
+def fetch_naver_records(ctx: CrawlContext) -> Iterator[Record]:
+    for records in crawl_pages(
+        ctx, "NAVER", ["https://d2.naver.com/d2.atom"], ctx.client.get_text, parse_naver_feed
+    ):
+        yield from records
+
+
+def parse_kakao_contents(url: str, payload: tuple[Any, Any]) -> list[Record]:
+    contents, event = payload
     event_start = event.get("data", {}).get("event", {}).get("startDate", "2025-01-01")
+    event_date = to_iso_datetime(f"{event_start}T00:00:00+09:00")
     content_map = contents.get("data", {}).get("contentMap", {})
     records: list[Record] = []
     for slot_items in content_map.values():
@@ -193,7 +278,7 @@ def fetch_kakao_records() -> list[Record]:
                     source="if(kakao)",
                     title=title,
                     link=link,
-                    date=to_iso_datetime(f"{event_start}T00:00:00+09:00"),
+                    date=event_date,
                     topic=topic,
                     tags=merged_tags,
                     evidence=f"sessionId={seq}",
@@ -202,53 +287,262 @@ def fetch_kakao_records() -> list[Record]:
     return records
 
 
+@SOURCES.register("KAKAO")
+def fetch_kakao_records(ctx: CrawlContext) -> Iterator[Record]:
+    # The event date and the session list come from two endpoints; both are requested at once.
+    event = ctx.engine.submit(ctx.client.get_json, "https://if.kakao.com/api/v1/events/2025")
+
+    def load(url: str) -> tuple[Any, Any]:
+        return ctx.client.get_json(url), event.result()
+
+    for records in crawl_pages(
+        ctx, "KAKAO", ["https://if.kakao.com/api/v1/contents"], load, parse_kakao_contents
+    ):
+        yield from records
+
+
+def is_line_post_slug(slug: str) -> bool:
+    return not slug.startswith(("author", "tag", "page")) and slug not in {"blog", "culture", "opensource", "careers"}
+
+
 def extract_line_links(html: str, locale: str) -> list[str]:
     pattern = rf'href="/{locale}/blog/([^"/]+)/"'
     slugs = set(re.findall(pattern, html))
-    filtered = sorted(
-        slug
-        for slug in slugs
-        if not slug.startswith(("author", "tag", "page"))
-        and slug not in {"blog", "culture", "opensource", "careers"}
-    )
+    filtered = sorted(slug for slug in slugs if is_line_post_slug(slug))
     return [normalize_url(f"https://engineering.linecorp.com/{locale}/blog/{slug}") for slug in filtered]
 
 
-def fetch_line_records() -> list[Record]:
+def line_record(link: str, locale: str, date: str = EPOCH) -> Record:
+    """A LINE post known only by its URL; the title comes from the slug until the page is enriched."""
+    slug = link.rstrip("/").split("/")[-1]
+    title = slug.replace("-", " ").strip()
+    return Record(
+        company="LINE",
+        source="LINE Engineering Blog",
+        title=title,
+        link=link,
+        date=date,
+        topic=infer_topic(title, []),
+        tags=[locale],
+        evidence=f"slug={slug}",
+    )
+
+
+def parse_line_listing(url: str, html: str) -> list[Record]:
+    locale = urlparse(url).path.split("/")[1]
+    return [line_record(link, locale) for link in extract_line_links(html, locale)]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _line_post_locale(link: str) -> str | None:
+    parts = urlparse(link).path.strip("/").split("/")
+    if len(parts) == 3 and parts[0] in LINE_LOCALES and parts[1] == "blog" and is_line_post_slug(parts[2]):
+        return parts[0]
+    return None
+
+
+def parse_line_discovery(url: str, xml_text: str | None) -> tuple[list[Record], list[str]]:
+    """Posts from a sitemap `urlset` or an RSS feed, plus child sitemaps of a sitemap index."""
+    if not xml_text:
+        return [], []
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return [], []
+    kind = _local_name(root.tag)
     records: list[Record] = []
-    seen_links: set[str] = set()
-    for locale in ("en", "ko"):
-        for page in range(1, 13):
-            url = (
-                f"https://engineering.linecorp.com/{locale}/blog"
-                if page == 1
-                else f"https://engineering.linecorp.com/{locale}/blog/page/{page}"
-            )
-            html = get_text(url)
-            links = extract_line_links(html, locale)
-            for link in links:
-                if link in seen_links:
-                    continue
-                seen_links.add(link)
-                slug = link.rstrip("/").split("/")[-1]
-                title = slug.replace("-", " ").strip()
-                topic = infer_topic(title, [])
-                records.append(
-                    Record(
-                        company="LINE",
-                        source="LINE Engineering Blog",
-                        title=title,
-                        link=link,
-                        date="1970-01-01T00:00:00+00:00",
-                        topic=topic,
-                        tags=[locale],
-                        evidence=f"slug={slug}",
-                    )
+    children: list[str] = []
+    if kind in {"urlset", "sitemapindex"}:
+        for entry in root:
+            fields = {_local_name(node.tag): (node.text or "").strip() for node in entry}
+            loc = fields.get("loc", "")
+            if not loc:
+                continue
+            if kind == "sitemapindex":
+                children.append(loc)
+                continue
+            link = normalize_url(loc)
+            locale = _line_post_locale(link)
+            if locale:
+                records.append(line_record(link, locale, to_iso_datetime(fields.get("lastmod"))))
+    elif kind == "rss":
+        for item in root.iter("item"):
+            title = (item.findtext("title") or "").strip()
+            link = normalize_url((item.findtext("link") or "").strip())
+            locale = _line_post_locale(link)
+            if not title or not locale:
+                continue
+            tags = [locale, *((node.text or "").strip() for node in item.findall("category") if node.text)]
+            records.append(
+                Record(
+                    company="LINE",
+                    source="LINE Engineering Blog",
+                    title=title,
+                    link=link,
+                    date=to_iso_datetime(item.findtext("pubDate")),
+                    topic=infer_topic(title, tags),
+                    tags=tags,
+                    evidence=f"feed={url}",
                 )
+            )
+    return records, children
+
+
+def get_optional_text(ctx: CrawlContext, url: str) -> str | None:
+    try:
+        response = ctx.client.get(url)
+    except requests.RequestException:
+        return None
+    return response.text if response.status_code == 200 else None
+
+
+def discover_line_records(ctx: CrawlContext) -> list[Record]:
+    """LINE posts from the discovery URL, newest first; empty if it is missing or unusable.
+
+    Discovery is one or two small requests, so it is left to the HTTP cache
+    rather than checkpointed page by page.
+    """
+
+    def discover(url: str) -> tuple[list[Record], list[str]]:
+        with METRICS.timer("sources", "LINE"):
+            xml_text = get_optional_text(ctx, url)
+        with METRICS.timer("parse", "LINE"):
+            records, children = parse_line_discovery(url, xml_text)
+        METRICS.incr("pages.fetched")
+        METRICS.incr("records.LINE", len(records))
+        return records, children
+
+    records, children = discover(ctx.line_discovery_url)
+    for nested, _ in ctx.engine.map(discover, children):
+        records.extend(nested)
+    return sort_records(records)
+
+
+@SOURCES.register("LINE", ordered=True, host_limits={"engineering.linecorp.com": PAGE_WINDOW})
+def fetch_line_records(ctx: CrawlContext) -> Iterator[Record]:
+    if ctx.line_mode == "sitemap":
+        discovered = discover_line_records(ctx)
+        if discovered:
+            yield from distinct_links(discovered)
+            return
+    # Listings are newest first; alternate locales so both advance together.
+    urls = (
+        f"https://engineering.linecorp.com/{locale}/blog"
+        if page == 1
+        else f"https://engineering.linecorp.com/{locale}/blog/page/{page}"
+        for page in range(1, ctx.line_pages + 1)
+        for locale in LINE_LOCALES
+    )
+    pages = crawl_pages(ctx, "LINE", urls, ctx.client.get_text, parse_line_listing, PAGE_WINDOW)
+    yield from distinct_links(chain.from_iterable(pages))
+
+
+_HEAD_END = re.compile(r"</head\s*>", re.IGNORECASE)
+
+
+def parse_line_article(record: Record, html: str) -> Record:
+    """`record` with the title, publish date and tags from its article page's `<head>`."""
+    from bs4 import BeautifulSoup
+
+    end = _HEAD_END.search(html)
+    soup = BeautifulSoup(html[: end.end()] if end else html, "html.parser")
+
+    def meta(*names: str) -> list[str]:
+        return [
+            node["content"].strip()
+            for node in soup.find_all("meta", content=True)
+            if (node.get("property") or node.get("name")) in names and node["content"].strip()
+        ]
+
+    titles = meta("og:title") or ([soup.title.get_text(strip=True)] if soup.title else [])
+    dates = meta("article:published_time", "og:article:published_time", "date")
+    keywords = meta("article:tag") or [
+        keyword.strip() for value in meta("keywords") for keyword in value.split(",") if keyword.strip()
+    ]
+    title = titles[0] if titles and titles[0] else record.title
+    tags = list(dict.fromkeys([*record.tags[:1], *keywords]))
+    slug = record.link.rstrip("/").split("/")[-1]
+    return Record(
+        company=record.company,
+        source=record.source,
+        title=title,
+        link=record.link,
+        date=to_iso_datetime(dates[0]) if dates else record.date,
+        topic=infer_topic(title, tags),
+        tags=tags,
+        evidence=f"article={slug}",
+    )
+
+
+def enrich_line_records(ctx: CrawlContext, records: list[Record], budget: int = LINE_ENRICH_BUDGET) -> int:
+    """Replace up to `budget` URL-only LINE records, in place, with what their pages say.
+
+    Only records the caller already selected are fetched. Returns how many
+    were enriched; pages that fail to load leave their record as it was and
+    are fetched again by a resumed run.
+    """
+    targets = [
+        index
+        for index, record in enumerate(records)
+        if record.company == "LINE" and record.evidence.startswith("slug=")
+    ][: max(budget, 0)]
+    by_link = {records[index].link: records[index] for index in targets}
+
+    def parse(url: str, html: str | None) -> list[Record]:
+        return [parse_line_article(by_link[url], html)] if html else []
+
+    pages = crawl_pages(
+        ctx, LINE_ARTICLES, [records[index].link for index in targets], partial(get_optional_text, ctx), parse
+    )
+    enriched = 0
+    for index, page_records in zip(targets, pages):
+        if page_records:
+            records[index] = page_records[0]
+            enriched += 1
+    METRICS.incr("line.enriched", enriched)
+    return enriched
+
+
+def parse_coupang_feed(feed_url: str, xml_text: str) -> list[Record]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(xml_text, "xml")
+    channel = soup.find("channel")
+    if channel is None:
+        return []
+    records: list[Record] = []
+    for item in channel.find_all("item"):
+        title = (item.find("title").text if item.find("title") else "").strip()
+        link = (item.find("link").text if item.find("link") else "").strip()
+        pub_date = (item.find("pubDate").text if item.find("pubDate") else "").strip()
+        categories = [
+            (category.text or "").strip() for category in item.find_all("category")
+        ]
+        categories = [c for c in categories if c]
+        if not title or not link:
+            continue
+        clean_link = normalize_url(link.split("?")[0])
+        topic = infer_topic(title, categories)
+        records.append(
+            Record(
+                company="COUPANG",
+                source="Coupang Engineering (Medium)",
+                title=title,
+                link=clean_link,
+                date=to_iso_datetime(pub_date),
+                topic=topic,
+                tags=categories,
+                evidence=f"feed={feed_url}",
+            )
+        )
     return records
 
 
-def fetch_coupang_records() -> list[Record]:
+@SOURCES.register("COUPANG", host_limits={"medium.com": PAGE_WINDOW})
+def fetch_coupang_records(ctx: CrawlContext) -> Iterator[Record]:
     feed_urls = [
         "https://medium.com/feed/coupang-engineering",
         "https://medium.com/feed/coupang-engineering/tagged/technology",
@@ -257,162 +551,342 @@ def fetch_coupang_records() -> list[Record]:
         "https://medium.com/feed/coupang-engineering/tagged/backend",
         "https://medium.com/feed/coupang-engineering/tagged/ai",
     ]
+    for records in crawl_pages(ctx, "COUPANG", feed_urls, ctx.client.get_text, parse_coupang_feed):
+        yield from records
+
+
+def baemin_page_url(page: int) -> str:
+    return (
+        "https://techblog.woowahan.com/wp-json/wp/v2/posts"
+        "?per_page=100&page="
+        f"{page}&_fields=id,date,link,title"
+    )
+
+
+def is_past_last_page(response: requests.Response) -> bool:
+    # WordPress answers a page beyond X-WP-TotalPages with 400 and this error code.
+    try:
+        return response.json().get("code") == WP_PAST_LAST_PAGE
+    except (ValueError, AttributeError):
+        return False
+
+
+def get_baemin_page(ctx: CrawlContext, url: str) -> list[dict[str, Any]] | None:
+    """One page of posts; empty past the last page, None if the page failed to load."""
+    response = ctx.client.get(url)
+    if response.status_code == 400 and is_past_last_page(response):
+        return []
+    if response.status_code != 200:
+        return None
+    total_pages = response.headers.get("X-WP-TotalPages", "")
+    if total_pages.isdigit():
+        ctx.state.set_cursor("BAEMIN", total_pages)
+    return response.json()
+
+
+def parse_baemin_page(url: str, data: list[dict[str, Any]] | None) -> list[Record]:
     records: list[Record] = []
-    for feed_url in feed_urls:
-        xml_text = get_text(feed_url)
-        soup = BeautifulSoup(xml_text, "xml")
-        channel = soup.find("channel")
-        if channel is None:
+    for item in data or []:
+        title = (item.get("title", {}).get("rendered", "") or "").strip()
+        link = (item.get("link") or "").strip()
+        date = (item.get("date") or "").strip()
+        if not title or not link:
             continue
-        for item in channel.find_all("item"):
-            title = (item.find("title").text if item.find("title") else "").strip()
-            link = (item.find("link").text if item.find("link") else "").strip()
-            pub_date = (item.find("pubDate").text if item.find("pubDate") else "").strip()
-            categories = [
-                (category.text or "").strip() for category in item.find_all("category")
-            ]
-            categories = [c for c in categories if c]
-            if not title or not link:
-                continue
-            clean_link = normalize_url(link.split("?")[0])
-            topic = infer_topic(title, categories)
-            records.append(
-                Record(
-                    company="COUPANG",
-                    source="Coupang Engineering (Medium)",
-                    title=title,
-                    link=clean_link,
-                    date=to_iso_datetime(pub_date),
-                    topic=topic,
-                    tags=categories,
-                    evidence=f"feed={feed_url}",
-                )
+        topic = infer_topic(title, [])
+        records.append(
+            Record(
+                company="BAEMIN",
+                source="Woowahan Tech Blog",
+                title=title,
+                link=normalize_url(link),
+                date=to_iso_datetime(date),
+                topic=topic,
+                tags=[],
+                evidence=f"postId={item.get('id')}",
             )
+        )
     return records
 
 
-def fetch_baemin_records() -> list[Record]:
-    records: list[Record] = []
-    page = 1
-    while True:
-        url = (
-            "https://techblog.woowahan.com/wp-json/wp/v2/posts"
-            "?per_page=100&page="
-            f"{page}&_fields=id,date,link,title"
-        )
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=TIMEOUT)
-        if response.status_code != 200:
-            break
-        data = response.json()
-        if not data:
-            break
-        for item in data:
-            title = (item.get("title", {}).get("rendered", "") or "").strip()
-            link = (item.get("link") or "").strip()
-            date = (item.get("date") or "").strip()
-            if not title or not link:
-                continue
-            topic = infer_topic(title, [])
-            records.append(
-                Record(
-                    company="BAEMIN",
-                    source="Woowahan Tech Blog",
-                    title=title,
-                    link=normalize_url(link),
-                    date=to_iso_datetime(date),
-                    topic=topic,
-                    tags=[],
-                    evidence=f"postId={item.get('id')}",
-                )
-            )
-        page += 1
-        if page > 10:
+@SOURCES.register("BAEMIN", ordered=True, host_limits={"techblog.woowahan.com": PAGE_WINDOW})
+def fetch_baemin_records(ctx: CrawlContext) -> Iterator[Record]:
+    load = partial(get_baemin_page, ctx)
+    # Page 1 reports the page count (kept as the source cursor); later pages
+    # are fetched a window at a time, newest posts first.
+    # An empty page is the end; a page that failed to load is skipped, and
+    # stays recorded as a failure so a resume fetches it again.
+    first_url = baemin_page_url(1)
+    [first_page] = crawl_pages(ctx, "BAEMIN", [first_url], load, parse_baemin_page)
+    total_pages = ctx.state.cursor("BAEMIN")
+    last_page = min(int(total_pages) if total_pages else ctx.baemin_pages, ctx.baemin_pages)
+    urls = [baemin_page_url(page) for page in range(2, last_page + 1)]
+    rest = crawl_pages(ctx, "BAEMIN", urls, load, parse_baemin_page, PAGE_WINDOW)
+    for url, page_records in zip([first_url, *urls], chain([first_page], rest)):
+        if not page_records and not ctx.state.has_failures("BAEMIN", url):
             break
-    return records
+        yield from page_records
+
+
+def distinct_links(records: Iterable[Record]) -> Iterator[Record]:
+    """Lazily skip repeated links, keeping the first occurrence."""
+    seen: set[str] = set()
+    for record in records:
+        if record.link not in seen:
+            seen.add(record.link)
+            yield record
+
+
+def newest_per_link(records: Iterable[Record]) -> list[Record]:
+    """One record per link, the newest (first seen on ties), in the order the kept records appear.
+
+    Keeping each record's own position, not its link's first one, breaks key
+    ties the way a stable sort of the whole source would.
+    """
+    newest: dict[str, Record] = {}
+    for record in records:
+        kept = newest.get(record.link)
+        if kept is None or record_key(record) > record_key(kept):
+            newest.pop(record.link, None)
+            newest[record.link] = record
+    return list(newest.values())
 
 
 def dedupe_records(records: list[Record]) -> list[Record]:
+    """Drop repeated links in place, keeping the first occurrence; returns `records`."""
     seen: set[str] = set()
-    deduped: list[Record] = []
+    kept = 0
     for record in records:
         key = record.link
         if key in seen:
             continue
         seen.add(key)
-        deduped.append(record)
-    return deduped
+        records[kept] = record
+        kept += 1
+    del records[kept:]
+    return records
 
 
 def sort_records(records: list[Record]) -> list[Record]:
-    return sorted(records, key=lambda r: (r.date, r.title), reverse=True)
+    """Sort newest first in place; returns `records`."""
+    records.sort(key=lambda r: (r.date, r.title), reverse=True)
+    return records
 
 
-def select_records(company_map: dict[str, list[Record]]) -> list[Record]:
-    selected: list[Record] = []
-    selected_links: set[str] = set()
+def counted(records: Iterable[Record], counts: Counter[str], company: str) -> Iterator[Record]:
+    for record in records:
+        counts[company] += 1
+        yield record
 
-    for company in COMPANY_ORDER:
-        candidates = company_map.get(company, [])
-        taken = 0
-        for record in candidates:
-            if record.link in selected_links:
-                continue
-            selected.append(record)
-            selected_links.add(record.link)
-            taken += 1
-            if taken >= MIN_PER_COMPANY:
+
+def near_unique(records: Iterable[Record], index: NearDuplicateIndex) -> Iterator[Record]:
+    """Skip records whose title joins a cluster already seen by `index` (shared across companies)."""
+    for record in records:
+        if index.is_new(record.title):
+            yield record
+
+
+def checkpointed(ctx: CrawlContext, company: str, records: Iterable[Record]) -> Iterator[Record]:
+    """Pass `records` through and, once they run out, mark the source complete with all of them.
+
+    A source with pages that failed to load ran out early, so it stays
+    incomplete and a resume walks it again to retry them.
+    """
+    seen: list[Record] = []
+    for record in records:
+        seen.append(record)
+        yield record
+    if not ctx.state.has_failures(company):
+        ctx.state.mark_complete(company, [asdict(record) for record in seen])
+
+
+def fetch_source(ctx: CrawlContext, company: str) -> Iterator[Record]:
+    """A source's records, replayed from the checkpoint if a resumed run already read it to the end."""
+    saved = ctx.state.completed_records(company)
+    if saved is not None:
+        METRICS.incr("sources.resumed")
+        return (Record(**row) for row in saved)
+    return checkpointed(ctx, company, SOURCES[company].fetch(ctx))
+
+
+def open_source(ctx: CrawlContext, company: str) -> Iterable[Record]:
+    """Start a source's generator and fetch enough of it to fill its quota.
+
+    Unordered sources are read fully, keeping the newest record per link.
+    Ordered sources only prefetch their first `MIN_PER_COMPANY` records;
+    the rest is fetched if and when selection pulls it. Only a source read
+    to the end is marked complete.
+    """
+    source = SOURCES[company]
+    if not source.ordered:
+        return newest_per_link(fetch_source(ctx, company))
+    records = distinct_links(fetch_source(ctx, company))
+    head = list(islice(records, MIN_PER_COMPANY))
+    return chain(head, records)
+
+
+def record_key(record: Record) -> tuple[str, str]:
+    return record.date, record.title
+
+
+def default_quotas(balance: str = "company") -> dict[str, int]:
+    groups = SOURCES.companies() if balance == "company" else TOPICS
+    return {group: MIN_PER_COMPANY for group in groups}
+
+
+def parse_quota(value: str) -> tuple[str, int]:
+    name, _, count = value.partition("=")
+    if not name or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"expected NAME=COUNT, got {value!r}")
+    return name, int(count)
+
+
+def selection_quotas(balance: str, overrides: Iterable[tuple[str, int]] = ()) -> dict[str, int]:
+    quotas = default_quotas(balance)
+    quotas.update(overrides)
+    return quotas
+
+
+def select_records(
+    company_map: Mapping[str, Iterable[Record]],
+    quotas: Mapping[str, int] | None = None,
+    balance: str = "company",
+    ordered: Collection[str] = (),
+    target: int = TARGET_COUNT,
+) -> list[Record]:
+    """Fill each group's quota with its newest records, then take the newest of the rest.
+
+    Groups are companies, or topics with `balance="topic"`; quotas default
+    to `MIN_PER_COMPANY` each and are filled in mapping order. Candidates
+    stream through bounded heaps, so inputs need not be sorted. Sources are
+    pulled in mapping order, so a filter shared across them (`near_unique`)
+    keeps the first company's copy. Sources named in `ordered` must yield
+    newest first; pulling from them stops as soon as nothing further could
+    be selected.
+    """
+    if quotas is None:
+        quotas = {company: MIN_PER_COMPANY for company in company_map} if balance == "company" else default_quotas(balance)
+    selector = QuotaSelector(target, quotas, attrgetter(balance), record_key, attrgetter("link"))
+    for rank, company in enumerate(company_map):
+        stream_group = company if balance == "company" else None
+        for position, record in enumerate(company_map[company]):
+            if company in ordered and not selector.could_take((record.date,), stream_group):
                 break
+            selector.offer(record, (rank, position))
+    return selector.result()
 
-    if len(selected) >= TARGET_COUNT:
-        return selected[:TARGET_COUNT]
 
-    extras: list[Record] = []
-    for company in COMPANY_ORDER:
-        for record in company_map.get(company, []):
-            if record.link in selected_links:
-                continue
-            extras.append(record)
+def dominant_pattern(category_scores: dict[str, int]) -> str:
+    """The highest-scoring full-text category, first in category order on ties; empty if none match."""
+    best = max(category_scores, key=category_scores.get, default="")
+    return best if best and category_scores[best] else ""
 
-    extras = sort_records(extras)
-    for record in extras:
-        if len(selected) >= TARGET_COUNT:
-            break
-        if record.link in selected_links:
-            continue
-        selected.append(record)
-        selected_links.add(record.link)
 
-    return selected[:TARGET_COUNT]
+def analyse_full_text(
+    client: HttpClient,
+    records: list[Record],
+    parser: str = "auto",
+    io_workers: int = MAX_WORKERS,
+    cpu_workers: int = CPU_WORKERS,
+    tokenizer: str = "ko-en",
+) -> int:
+    """Fill the analysis fields of `records` in place from their article bodies.
 
+    Bodies go through the Toss pipeline (cached downloads on threads, the
+    streaming extractor and keyword scoring on processes), so both corpora
+    carry the same category scores and keywords. Keywords are ranked by
+    TF-IDF across the records when numpy/scipy are installed. Returns how
+    many records were analysed; failed downloads keep empty fields.
+    """
+    import tfidf
 
-def write_jsonl(records: list[Record]) -> None:
-    with OUT_JSONL.open("w", encoding="utf-8") as file:
+    by_link = {record.link: record for record in records}
+    articles = list(
+        analyse_pipeline(
+            client,
+            list(by_link),
+            io_workers=io_workers,
+            cpu_workers=cpu_workers,
+            parser=parser,
+            tokenizer=tokenizer,
+        )
+    )
+    if not articles:
+        return 0
+    if tfidf.available():
+        keywords = tfidf.TfidfModel([article.term_counts for article in articles]).top_terms(TOP_KEYWORDS)
+    else:
+        keywords = [article.top_keywords for article in articles]
+    for article, top_keywords in zip(articles, keywords):
+        record = by_link[article.url]
+        record.pattern = dominant_pattern(article.category_scores)
+        record.word_count = article.word_count
+        record.category_scores = article.category_scores
+        record.top_keywords = top_keywords
+        record.excerpt = article.excerpt
+    return len(articles)
+
+
+def record_row(record: Record) -> dict[str, Any]:
+    return {
+        "company": record.company,
+        "source": record.source,
+        "title": record.title,
+        "link": record.link,
+        "date": record.date,
+        "topic": record.topic,
+        "tags": record.tags,
+        "pattern": record.pattern,
+        "evidence": record.evidence,
+        "word_count": record.word_count,
+        # Every row carries every category so columnar exports get one stable struct.
+        "category_scores": {category: record.category_scores.get(category, 0) for category in FULL_TEXT_CATEGORIES},
+        "top_keywords": record.top_keywords,
+        "excerpt": record.excerpt,
+    }
+
+
+def write_jsonl(
+    records: Iterable[Record],
+    path: Path = OUT_JSONL,
+    compression: str = "none",
+    snapshot: SnapshotSink | None = None,
+) -> Path:
+    with JsonlSink(path, compression) as sink:
         for record in records:
-            file.write(
-                json.dumps(
-                    {
-                        "company": record.company,
-                        "source": record.source,
-                        "title": record.title,
-                        "link": record.link,
-                        "date": record.date,
-                        "topic": record.topic,
-                        "tags": record.tags,
-                        "pattern": "",
-                        "evidence": record.evidence,
-                    },
-                    ensure_ascii=False,
-                )
-                + "\n"
-            )
+            row = record_row(record)
+            sink.write(row)
+            if snapshot is not None:
+                snapshot.write(row)
+    return sink.path
+
+
+def snapshot_sink(store: SnapshotStore | None, changes: Path = OUT_CHANGES) -> SnapshotSink:
+    """Snapshots the corpus rows by normalized link, counting coverage per company.
+
+    Full-text keywords are ranked by TF-IDF across the selection, so they are
+    hashed apart and a row whose keywords only moved is listed as recomputed.
+    """
+    return SnapshotSink(
+        store,
+        changes,
+        key=lambda row: normalize_url(row["link"]),
+        group=itemgetter("company"),
+        derived=CORPUS_DERIVED_COLUMNS,
+    )
 
 
 def write_summary(
     all_company_counts: dict[str, int],
     selected_records: list[Record],
+    jsonl_path: Path = OUT_JSONL,
+    near_duplicates: int = 0,
+    full_text_analysed: int = 0,
+    changes: SnapshotDiff | None = None,
+    history: list[dict[str, Any]] | None = None,
 ) -> None:
     selected_company_counts = Counter(record.company for record in selected_records)
     selected_topic_counts = Counter(record.topic for record in selected_records)
+    selected_pattern_counts = Counter(record.pattern or "unclassified" for record in selected_records)
     timestamp = datetime.now(timezone.utc).isoformat()
 
     lines: list[str] = []
@@ -422,15 +896,17 @@ def write_summary(
     lines.append(f"- target_count: `{TARGET_COUNT}`")
     lines.append(f"- selected_count: `{len(selected_records)}`")
     lines.append(f"- min_per_company_target: `{MIN_PER_COMPANY}`")
+    lines.append(f"- near_duplicates_removed: `{near_duplicates}`")
+    lines.append(f"- full_text_analysed: `{full_text_analysed}`")
     lines.append("")
     lines.append("## Coverage (Collected)")
     lines.append("")
-    for company in COMPANY_ORDER:
+    for company in SOURCES.companies():
         lines.append(f"- {company}: {all_company_counts.get(company, 0)}")
     lines.append("")
     lines.append("## Coverage (Selected)")
     lines.append("")
-    for company in COMPANY_ORDER:
+    for company in SOURCES.companies():
         lines.append(f"- {company}: {selected_company_counts.get(company, 0)}")
     lines.append("")
     lines.append("## Topic Distribution (Selected)")
@@ -438,45 +914,291 @@ def write_summary(
     for topic, count in sorted(selected_topic_counts.items(), key=lambda item: item[1], reverse=True):
         lines.append(f"- {topic}: {count}")
     lines.append("")
+    lines.append("## Pattern Distribution (Selected, Full Text)")
+    lines.append("")
+    for pattern, count in sorted(selected_pattern_counts.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"- {pattern}: {count}")
+    lines.append("")
+    if changes is not None:
+        lines.append("## Changes Since Previous Build")
+        lines.append("")
+        lines.append(f"- snapshot: `{changes.snapshot}`")
+        lines.append(f"- previous_snapshot: `{changes.previous or '-'}`")
+        lines.append(f"- added: {changes.added}")
+        lines.append(f"- removed: {changes.removed}")
+        lines.append(f"- modified: {changes.modified}")
+        lines.append(f"- recomputed (keywords only): {changes.recomputed}")
+        lines.append("")
+    if history:
+        companies = SOURCES.companies()
+        lines.append("## Coverage History (Selected)")
+        lines.append("")
+        lines.append(f"| build (UTC) | {' | '.join(companies)} | added | removed | modified |")
+        lines.append(f"|---|{'---|' * len(companies)}---|---|---|")
+        for build in history:
+            counts = " | ".join(str(build["groups"].get(company, 0)) for company in companies)
+            lines.append(
+                f"| {build['created_at_utc'][:16].replace('T', ' ')} | {counts} | {build['added']} | {build['removed']} | {build['modified']} |"
+            )
+        lines.append("")
     lines.append("## Data Files")
     lines.append("")
-    lines.append(f"- `{OUT_JSONL}`")
+    lines.append(f"- `{jsonl_path}`")
     lines.append(f"- `{OUT_SUMMARY_MD}`")
+    if changes is not None:
+        lines.append(f"- `{OUT_CHANGES}`")
     lines.append("")
     lines.append("## Notes")
     lines.append("")
-    lines.append("- `LINE`은 페이지 크롤링 기반이라 일부 문서는 날짜 정보가 없고, `1970-01-01`로 표준화됩니다.")
+    lines.append("- `LINE`은 sitemap/RSS로 글 목록을 찾고, 선택된 글만 본문 페이지 메타데이터로 제목·날짜·태그를 보강합니다.")
+    lines.append("- 보강하지 못한 `LINE` 글은 날짜 정보가 없어 `1970-01-01`로 표준화됩니다.")
     lines.append("- `KAKAO`는 `if.kakao` 공개 API(`/api/v1/contents`)에서 세션 메타데이터를 수집합니다.")
     lines.append("- `COUPANG`은 Medium publication feed + tagged feed를 결합합니다.")
     lines.append("- 모든 Medium 링크는 query string 제거 후 dedupe 처리합니다.")
+    lines.append("- `pattern`·`category_scores`·`top_keywords`는 선택된 글의 본문을 Toss 분석과 같은 추출기·카테고리로 분석한 값입니다.")
+    lines.append("- 제목 MinHash/LSH 유사도로 회사·로케일 간 중복 글(LINE en/ko, Medium 재게시)을 하나만 남깁니다.")
+    lines.append("- 빌드마다 행 해시로 스냅샷을 남기고, 직전 빌드 대비 추가·삭제·변경된 행만 change feed(`-changes.jsonl`)에 기록합니다.")
 
-    OUT_SUMMARY_MD.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    write_text_atomic(OUT_SUMMARY_MD, "\n".join(lines) + "\n")
 
 
-def main() -> None:
-    source_records = {
-        "NAVER": dedupe_records(sort_records(fetch_naver_records())),
-        "KAKAO": dedupe_records(sort_records(fetch_kakao_records())),
-        "LINE": dedupe_records(sort_records(fetch_line_records())),
-        "COUPANG": dedupe_records(sort_records(fetch_coupang_records())),
-        "BAEMIN": dedupe_records(sort_records(fetch_baemin_records())),
-    }
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="reuse pages checkpointed by an interrupted run instead of starting over",
+    )
+    parser.add_argument("--state", type=Path, default=None, help=f"crawl state database (default: {OUT_STATE})")
+    parser.add_argument(
+        "--line-mode",
+        choices=LINE_MODES,
+        default="sitemap",
+        help="discover LINE posts from one sitemap/RSS request, or scrape the listing pages",
+    )
+    parser.add_argument(
+        "--line-discovery-url",
+        default=LINE_DISCOVERY_URL,
+        help="sitemap, sitemap index or RSS feed for --line-mode sitemap (falls back to listing if unusable)",
+    )
+    parser.add_argument("--line-pages", type=int, default=LINE_PAGES, help="LINE listing pages per locale")
+    parser.add_argument(
+        "--line-enrich-budget",
+        type=int,
+        default=LINE_ENRICH_BUDGET,
+        help="max selected LINE posts whose pages are fetched for title, date and tags (0 disables)",
+    )
+    parser.add_argument("--baemin-pages", type=int, default=BAEMIN_PAGES, help="max WordPress pages for BAEMIN")
+    parser.add_argument("--compress", choices=COMPRESSIONS, default="none", help="compress the JSONL output")
+    parser.add_argument(
+        "--columnar",
+        choices=FORMATS,
+        default="none",
+        help="also write a Parquet or Arrow copy of the corpus for query_corpus.py",
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=float,
+        default=NEAR_DUP_THRESHOLD,
+        help="title Jaccard similarity at which records count as duplicates (0 disables)",
+    )
+    parser.add_argument(
+        "--balance",
+        choices=BALANCES,
+        default="company",
+        help=f"spread the {MIN_PER_COMPANY}-record minimums over companies or over topics",
+    )
+    parser.add_argument(
+        "--quota",
+        type=parse_quota,
+        action="append",
+        default=[],
+        metavar="NAME=COUNT",
+        help="override one company's (or topic's) minimum, e.g. LINE=25 or design=30; repeatable",
+    )
+    parser.add_argument(
+        "--no-full-text",
+        action="store_true",
+        help="skip downloading and analysing the selected articles' bodies",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=PARSERS,
+        default="auto",
+        help="auto uses lxml when installed, then the stdlib streaming parser; bs4 is the old tree parser",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=TOKENIZERS,
+        default="ko-en",
+        help="ko-en strips Korean particles/endings and folds English plurals; regex only lowercases",
+    )
+    parser.add_argument("--io-workers", type=int, default=MAX_WORKERS, help="full-text download threads")
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=CPU_WORKERS,
+        help="full-text analysis processes (0 analyses on the main thread)",
+    )
+    add_snapshot_arguments(parser)
+    add_client_arguments(parser)
+    add_cache_arguments(parser)
+    add_instrumentation_arguments(parser)
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
 
-    all_company_counts = {company: len(records) for company, records in source_records.items()}
-    selected_records = select_records(source_records)
-    selected_records = dedupe_records(sort_records(selected_records))
-    selected_records = selected_records[:TARGET_COUNT]
+def connection_pool_size(args: argparse.Namespace) -> int:
+    """Connections per host: the page fetch pool or the full-text download threads, whichever is larger."""
+    return max(MAX_WORKERS, args.io_workers)
 
-    write_jsonl(selected_records)
-    write_summary(all_company_counts, selected_records)
+
+def crawl_context(
+    args: argparse.Namespace, engine: FetchEngine, client: HttpClient, state: CrawlState
+) -> CrawlContext:
+    return CrawlContext(
+        engine=engine,
+        client=client,
+        state=state,
+        line_pages=args.line_pages,
+        line_mode=args.line_mode,
+        line_discovery_url=args.line_discovery_url,
+        baemin_pages=args.baemin_pages,
+    )
+
+
+def crawl_and_select(
+    ctx: CrawlContext,
+    args: argparse.Namespace,
+    collected_counts: Counter[str],
+    near_index: NearDuplicateIndex | None = None,
+) -> list[Record]:
+    """Crawl every source, skip near-duplicate titles and select the corpus.
+
+    `collected_counts` receives the records each company yielded before the
+    near-duplicate filter; for ordered sources, only as many as selection pulled.
+    Of each near-duplicate cluster, the record pulled first is kept: companies
+    in registration order, each newest first.
+    """
+    with METRICS.stage("crawl"):
+        opened = ctx.engine.run({company: partial(open_source, ctx, company) for company in SOURCES.companies()})
+    source_records: dict[str, Iterable[Record]] = {}
+    for company, records in opened.items():
+        if SOURCES[company].ordered:
+            records = counted(records, collected_counts, company)
+        else:
+            collected_counts[company] = len(records)
+        source_records[company] = near_unique(records, near_index) if near_index else records
+    # Selection pulls from the sources lazily, so ordered sources fetch more pages only here.
+    with METRICS.stage("select"):
+        return select_records(
+            source_records,
+            selection_quotas(args.balance, args.quota),
+            args.balance,
+            ordered=[source.company for source in SOURCES if source.ordered],
+        )
+
+
+def build(args: argparse.Namespace, client: HttpClient | None = None) -> dict[str, Any]:
+    """Crawl, select and write the corpus; a caller-supplied `client` is shared and left open."""
+    owns_client = client is None
+    if client is None:
+        client = HttpClient(
+            user_agent=USER_AGENT,
+            timeout=TIMEOUT,
+            pool_size=connection_pool_size(args),
+            cache=cache_from_args(args),
+            offline=args.offline,
+            per_host_requests_per_second=args.per_host_requests_per_second,
+            base_url=args.base_url,
+        )
+    if notice := matcher_notice():
+        print(notice)
+    state = CrawlState(args.state or OUT_STATE, resume=args.resume)
+    collected_counts: Counter[str] = Counter()
+    near_index = NearDuplicateIndex(args.near_dup_threshold) if args.near_dup_threshold else None
+    crawl_started = time.perf_counter()
+    with FetchEngine(host_limits=SOURCES.host_limits()) as engine, client if owns_client else nullcontext(), state:
+        ctx = crawl_context(args, engine, client, state)
+        selected_records = crawl_and_select(ctx, args, collected_counts, near_index)
+        with METRICS.stage("enrich"):
+            line_enriched = enrich_line_records(ctx, selected_records, args.line_enrich_budget)
+        # Selection comes back newest first; enriched LINE dates can move those records.
+        if line_enriched:
+            sort_records(selected_records)
+        full_text_analysed = 0
+        if not args.no_full_text:
+            with METRICS.stage("full_text"):
+                full_text_analysed = analyse_full_text(
+                    client, selected_records, args.html_parser, args.io_workers, args.cpu_workers, args.tokenizer
+                )
+    crawl_seconds = time.perf_counter() - crawl_started
+
+    all_company_counts = dict(collected_counts)
+    near_duplicates = near_index.duplicates if near_index else 0
+
+    store = snapshot_store_from_args(args, SNAPSHOT_NAME)
+    with METRICS.stage("write"):
+        with snapshot_sink(store) as snapshot:
+            jsonl_path = write_jsonl(selected_records, OUT_JSONL, args.compress, snapshot)
+        history = store.history(HISTORY_BUILDS) if store is not None else None
+        write_summary(
+            all_company_counts,
+            selected_records,
+            jsonl_path,
+            near_duplicates,
+            full_text_analysed,
+            snapshot.diff,
+            history,
+        )
+        if args.columnar != "none":
+            table_path = columnar_path(OUT_JSONL, args.columnar)
+            write_rows((record_row(record) for record in selected_records), table_path, args.columnar)
+            print("saved:", table_path)
 
     selected_company_counts = Counter(record.company for record in selected_records)
-    print("saved:", OUT_JSONL)
+    print("saved:", jsonl_path)
     print("saved:", OUT_SUMMARY_MD)
+    if snapshot.diff is not None:
+        print("saved:", OUT_CHANGES)
+        diff = snapshot.diff
+        print(
+            f"changes: +{diff.added} -{diff.removed} ~{diff.modified}, "
+            f"keywords recomputed: {diff.recomputed} (snapshot {diff.snapshot[:12]})"
+        )
+    print("near-duplicates removed:", near_duplicates)
+    print("LINE posts enriched:", line_enriched)
+    print("full-text analysed:", full_text_analysed)
     print("selected:", len(selected_records))
-    for company in COMPANY_ORDER:
+    for company in SOURCES.companies():
         print(f"{company}: {selected_company_counts.get(company, 0)} / collected {all_company_counts.get(company, 0)}")
 
+    collected = sum(all_company_counts.values())
+    return {
+        "records_collected": collected,
+        "records_selected": len(selected_records),
+        "near_duplicates_removed": near_duplicates,
+        "line_enriched": line_enriched,
+        "full_text_analysed": full_text_analysed,
+        "crawl_records_per_second": round(collected / crawl_seconds, 1) if crawl_seconds else 0.0,
+        "keyword_matcher": MATCHER,
+        **(snapshot.diff.stats() if snapshot.diff is not None else {}),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    METRICS.reset()
+    with profiling(args) as profile:
+        stats = build(args)
+    report_path = args.report or OUT_REPORT
+    report = METRICS.report(**stats, **profile)
+    write_text_atomic(report_path, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    print("saved:", report_path)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,132 @@
+"""Columnar (Parquet / Arrow IPC) copies of the JSONL outputs for fast queries."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from jsonl_sink import FILE_MODE, SUFFIXES, _fsync_dir
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for columnar output and queries
+    pa = pc = pq = None
+
+FORMATS = ("none", "parquet", "arrow")
+FORMAT_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+DICTIONARY_COLUMNS = ("company", "source", "topic")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("columnar output needs the pyarrow package")
+
+
+def columnar_path(jsonl_path: Path, fmt: str) -> Path:
+    """`corpus.jsonl[.gz|.zst]` -> `corpus.parquet` / `corpus.arrow`."""
+    name = Path(jsonl_path).name
+    for suffix in SUFFIXES.values():
+        if suffix and name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return Path(jsonl_path).with_name(Path(name).stem + FORMAT_SUFFIXES.get(fmt, ""))
+
+
+def format_of(path: Path) -> str:
+    for fmt, suffix in FORMAT_SUFFIXES.items():
+        if Path(path).name.endswith(suffix):
+            return fmt
+    raise ValueError(f"not a columnar file: {path}")
+
+
+class ColumnarSink:
+    """Collects rows column by column and writes one Parquet or Arrow IPC file on exit.
+
+    Low-cardinality columns (`company`, `source`, `topic`) are dictionary
+    encoded, and nested dicts become struct columns. Arrow IPC files are
+    written uncompressed so `read_table` can memory-map them without a copy.
+    With `fmt="none"` the sink accepts rows and writes nothing, so callers
+    can always write to it. Like `JsonlSink`, the file is replaced atomically
+    and only when the block exits cleanly.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: str = "parquet",
+        dictionary_columns: Sequence[str] = DICTIONARY_COLUMNS,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown columnar format: {fmt}")
+        if fmt != "none":
+            _require_pyarrow()
+        self.path = Path(path)
+        self.fmt = fmt
+        self.dictionary_columns = tuple(dictionary_columns)
+        self.count = 0
+        self._columns: dict[str, list[Any]] = {}
+
+    def __enter__(self) -> ColumnarSink:
+        return self
+
+    def write(self, row: dict[str, Any]) -> None:
+        if self.fmt == "none":
+            return
+        for key, value in row.items():
+            self._columns.setdefault(key, [None] * self.count).append(value)
+        self.count += 1
+        for values in self._columns.values():
+            if len(values) < self.count:
+                values.append(None)
+
+    def table(self) -> pa.Table:
+        table = pa.table(self._columns)
+        for name in self.dictionary_columns:
+            if name in table.column_names:
+                index = table.column_names.index(name)
+                table = table.set_column(index, name, pc.dictionary_encode(table.column(name)))
+        return table
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is not None or self.fmt == "none":
+            return
+        table = self.table()
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        os.fchmod(fd, FILE_MODE)
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                if self.fmt == "parquet":
+                    pq.write_table(table, raw)
+                else:
+                    with pa.ipc.new_file(raw, table.schema) as writer:
+                        writer.write_table(table)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_name, self.path)
+            _fsync_dir(self.path.parent)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def write_rows(rows: Iterable[dict[str, Any]], path: Path, fmt: str) -> int:
+    with ColumnarSink(path, fmt) as sink:
+        for row in rows:
+            sink.write(row)
+    return sink.count
+
+
+def read_table(path: Path, columns: Sequence[str] | None = None, flatten: bool = True) -> pa.Table:
+    """Open a columnar export; Arrow IPC files are memory-mapped rather than read."""
+    _require_pyarrow()
+    if format_of(path) == "parquet":
+        table = pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(list(columns))
+    # Struct columns such as category_scores become category_scores.<name>.
+    return table.flatten() if flatten else table
@@ -0,0 +1,145 @@
+"""SQLite-backed crawl checkpoints so interrupted builds can resume."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    records TEXT NOT NULL,
+    PRIMARY KEY (source, url)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    cursor TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_records (
+    source TEXT PRIMARY KEY,
+    records TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    failed_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, url)
+);
+"""
+TABLES = ("pages", "sources", "source_records", "failures")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CrawlState:
+    """Per-source page checkpoints with the records parsed from each page.
+
+    Every completed page is committed as soon as it is parsed. A fresh run
+    clears the store. With `resume=True`, pages already recorded are served
+    from it, so the crawl picks up where the previous run stopped. Sources
+    that ran to the end are replayed from their stored records without
+    walking their pages, and pages that failed to load are kept out of
+    `pages` so the resumed run fetches them again.
+    """
+
+    def __init__(self, path: Path, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.resume = resume
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            if not resume:
+                for table in TABLES:
+                    self._conn.execute(f"DELETE FROM {table}")
+
+    def __enter__(self) -> CrawlState:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def load_page(self, source: str, url: str) -> list[dict[str, Any]] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT records FROM pages WHERE source = ? AND url = ?", (source, url)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_page(self, source: str, url: str, records: list[dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (source, url, fetched_at, records) VALUES (?, ?, ?, ?)",
+                (source, url, _now(), json.dumps(records, ensure_ascii=False)),
+            )
+            self._conn.execute("DELETE FROM failures WHERE source = ? AND url = ?", (source, url))
+
+    def record_failure(self, source: str, url: str) -> None:
+        """Note a page that failed to load; unlike an empty page, it is retried on resume."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO failures (source, url, failed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(source, url) DO UPDATE SET failed_at = excluded.failed_at, attempts = attempts + 1",
+                (source, url, _now()),
+            )
+
+    def has_failures(self, source: str, url: str | None = None) -> bool:
+        """Whether `source` (or just its page at `url`) has a failed load not since retried successfully."""
+        query, params = "SELECT 1 FROM failures WHERE source = ?", (source,)
+        if url is not None:
+            query, params = f"{query} AND url = ?", (source, url)
+        with self._lock:
+            row = self._conn.execute(f"{query} LIMIT 1", params).fetchone()
+        return row is not None
+
+    def cursor(self, source: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT cursor FROM sources WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, source: str, cursor: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sources (source, cursor, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET cursor = excluded.cursor, updated_at = excluded.updated_at",
+                (source, cursor, _now()),
+            )
+
+    def mark_complete(self, source: str, records: list[dict[str, Any]]) -> None:
+        """Record that `source` was read to the end, with every record it yielded in order."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sources (source, complete, updated_at) VALUES (?, 1, ?) "
+                "ON CONFLICT(source) DO UPDATE SET complete = 1, updated_at = excluded.updated_at",
+                (source, _now()),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO source_records (source, records) VALUES (?, ?)",
+                (source, json.dumps(records, ensure_ascii=False)),
+            )
+
+    def completed_records(self, source: str) -> list[dict[str, Any]] | None:
+        """The records of a source marked complete, or None if it has not been read to the end."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT r.records FROM sources s JOIN source_records r USING (source) "
+                "WHERE s.source = ? AND s.complete = 1",
+                (source,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
@@ -0,0 +1,475 @@
+"""Randomized checks that the optimized paths still match what they replaced.
+
+Each check feeds random inputs, with forced ties and awkward shapes, to an
+optimized function and to a reference copy of the implementation it
+replaced, and reports every input on which the two disagree:
+
+- `select_records` (one-pass quota heaps) against the old sort, dedupe and
+  two-phase selection;
+- the streaming and lxml article extractors against the BeautifulSoup tree;
+- the memoized `normalize_url` and `to_iso_datetime` against the plain
+  versions they replaced.
+
+Regression checks for behaviour that review found broken run alongside them.
+
+Run them with `bench_research.py --verify`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import re
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+from urllib.parse import urlparse, urlunparse
+
+import tfidf
+from build_nekaracuba_corpus import (
+    Record,
+    dedupe_records,
+    near_unique,
+    newest_per_link,
+    record_row,
+    select_records,
+    snapshot_sink,
+    sort_records,
+)
+from generate_toss_analysis import KEYWORDS, SummaryTotals, apply_tfidf
+from html_extract import etree, extract_bs4, extract_lxml, extract_streaming
+from near_dupes import NearDuplicateIndex
+from normalize import EPOCH, normalize_url, to_iso_datetime
+from snapshots import SnapshotStore
+
+DEFAULT_ROUNDS = 500
+# Mismatches printed per check; the count covers all of them.
+SHOWN_MISMATCHES = 3
+
+
+@dataclass
+class CheckResult:
+    name: str
+    cases: int
+    mismatches: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+# --- selection ---------------------------------------------------------------
+
+
+def reference_select_records(company_map: Mapping[str, list[Record]], quota: int, target: int) -> list[Record]:
+    """The selection before the quota heaps: sort and dedupe each source, fill quotas, then merge the rest.
+
+    The builder sorted the result afterwards, so this does too. The old loop
+    checked the quota only after taking a record, so `quota` must be positive.
+    """
+    streams = {company: iter(dedupe_records(sort_records(list(records)))) for company, records in company_map.items()}
+    selected: list[Record] = []
+    selected_links: set[str] = set()
+    for candidates in streams.values():
+        taken = 0
+        for record in candidates:
+            if record.link in selected_links:
+                continue
+            selected.append(record)
+            selected_links.add(record.link)
+            taken += 1
+            if taken >= quota:
+                break
+    if len(selected) < target:
+        for record in heapq.merge(*streams.values(), key=lambda r: (r.date, r.title), reverse=True):
+            if len(selected) >= target:
+                break
+            if record.link in selected_links:
+                continue
+            selected.append(record)
+            selected_links.add(record.link)
+    return sort_records(selected[:target])
+
+
+def random_company_map(rng: random.Random) -> dict[str, list[Record]]:
+    """A few companies with unsorted records; few distinct dates and titles force key ties, links repeat within a company."""
+    dates = [f"2025-{month:02d}-01T00:00:00+00:00" for month in rng.sample(range(1, 13), rng.randint(1, 4))]
+    titles = [f"title {index}" for index in range(rng.randint(1, 3))]
+    company_map: dict[str, list[Record]] = {}
+    for company in rng.sample(["NAVER", "KAKAO", "LINE", "COUPANG", "BAEMIN"], rng.randint(1, 5)):
+        links = [f"https://{company.lower()}.example/{index}" for index in range(rng.randint(1, 30))]
+        company_map[company] = [
+            Record(
+                company=company,
+                source=company,
+                title=rng.choice(titles),
+                link=rng.choice(links),
+                date=rng.choice(dates),
+                topic="other",
+                tags=[],
+                evidence=f"case {index}",
+            )
+            for index in range(rng.randint(0, 40))
+        ]
+    return company_map
+
+
+def check_selection(rounds: int, seed: int = 0) -> CheckResult:
+    rng = random.Random(seed)
+    result = CheckResult("select_records", rounds)
+
+    def describe(records: Iterable[Record]) -> list[tuple[str, str, str, str]]:
+        return [(record.company, record.date, record.title, record.evidence) for record in records]
+
+    for case in range(rounds):
+        company_map = random_company_map(rng)
+        quota, target = rng.randint(1, 8), rng.randint(1, 40)
+        quotas = {company: quota for company in company_map}
+        expected = describe(reference_select_records(company_map, quota, target))
+        # The builder's two paths: unordered sources reduced per link, ordered ones as sorted streams.
+        # The builder mixes both, so tied keys must break by company order whichever kind a company is.
+        mixed = [company for company in company_map if rng.random() < 0.5]
+        for label, ordered_names in (("unordered", []), ("ordered", list(company_map)), ("mixed", mixed)):
+            sources = {
+                company: iter(dedupe_records(sort_records(list(records))))
+                if company in ordered_names
+                else newest_per_link(records)
+                for company, records in company_map.items()
+            }
+            actual = describe(select_records(sources, quotas, ordered=ordered_names, target=target))
+            if actual != expected:
+                result.mismatches.append(f"case {case} ({label}, quota={quota}, target={target})")
+    return result
+
+
+# --- article extraction --------------------------------------------------------
+
+_WORDS = ("design", "system", "토스", "디자인", "a&b", "<tag>", "x y", "  spaced  ", "줄\n바꿈", "&nbsp;")
+_INLINE = ("span", "em", "strong", "code", "a")
+# Blocks that may hold other blocks; the rest ("p", "h2", "li" in a list) hold inline content only.
+_CONTAINERS = ("div", "section")
+
+
+def random_text(rng: random.Random) -> str:
+    word = rng.choice(_WORDS)
+    return word if word == "&nbsp;" else escape(word, quote=False)
+
+
+def random_inline(rng: random.Random, depth: int = 0, in_link: bool = False) -> str:
+    """Text, comments, scripts and inline elements, nested validly so no parser has to repair them."""
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if roll < 0.45 or depth > 3:
+            parts.append(random_text(rng))
+        elif roll < 0.6:
+            parts.append(f"{random_text(rng)}<!-- {rng.choice(_WORDS)} -->{random_text(rng)}")
+        elif roll < 0.67:
+            tag = rng.choice(("script", "style"))
+            parts.append(f"<{tag}>var x = '{rng.choice(_WORDS)}';</{tag}>")
+        elif roll < 0.72:
+            parts.append("<br>")
+        else:
+            tag = rng.choice(_INLINE[:-1] if in_link else _INLINE)
+            parts.append(f"<{tag}>{random_inline(rng, depth + 1, in_link or tag == 'a')}</{tag}>")
+        parts.append(rng.choice(("", " ", "\n", "\t ")))
+    return "".join(parts)
+
+
+def random_blocks(rng: random.Random, depth: int = 0) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if roll < 0.3:
+            parts.append(random_inline(rng, 1))
+        elif roll < 0.6 or depth > 2:
+            tag = rng.choice(("p", "h2"))
+            parts.append(f"<{tag}>{random_inline(rng)}</{tag}>")
+        elif roll < 0.75:
+            items = "".join(f"<li>{random_inline(rng)}</li>" for _ in range(rng.randint(1, 3)))
+            parts.append(f"<ul>{items}</ul>")
+        else:
+            tag = rng.choice(_CONTAINERS)
+            parts.append(f"<{tag}>{random_blocks(rng, depth + 1)}</{tag}>")
+        parts.append(rng.choice(("", "\n", "\n  ")))
+    return "".join(parts)
+
+
+def random_document(rng: random.Random) -> str:
+    title = " ".join(random_text(rng) for _ in range(rng.randint(1, 3)))
+    head = f"<title>{title}</title>" if rng.random() < 0.7 else ""
+    body = [random_blocks(rng)]
+    if rng.random() < 0.6:
+        body.append(f"<h1>{random_inline(rng, 2)}</h1>")
+    if rng.random() < 0.7:
+        body.append(f"<article>{random_blocks(rng)}<article>{random_blocks(rng, 2)}</article></article>")
+    body.append(random_blocks(rng))
+    doctype = "<!DOCTYPE html>\n" if rng.random() < 0.5 else ""
+    return f"{doctype}<html><head>{head}</head><body>{''.join(body)}</body></html>"
+
+
+def check_extractors(rounds: int, seed: int = 0) -> CheckResult:
+    rng = random.Random(seed)
+    extractors: dict[str, Callable[[str], Any]] = {"stdlib": extract_streaming}
+    if etree is not None:
+        extractors["lxml"] = extract_lxml
+    result = CheckResult(f"extract_page[{','.join(extractors)}] vs bs4", rounds)
+    for case in range(rounds):
+        html = random_document(rng)
+        expected = extract_bs4(html)
+        for name, extract in extractors.items():
+            actual = extract(html)
+            if (actual.title, actual.chunks) != (expected.title, expected.chunks):
+                result.mismatches.append(f"case {case} ({name}): {html[:120]!r}")
+    return result
+
+
+# --- normalization -------------------------------------------------------------
+
+
+def reference_normalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    netloc = parsed.netloc.lower()
+    path = re.sub(r"/+", "/", parsed.path).rstrip("/")
+    if not path:
+        path = "/"
+    return urlunparse((parsed.scheme, netloc, path, "", "", ""))
+
+
+def reference_to_iso_datetime(value: str | None) -> str:
+    if not value:
+        return EPOCH
+    value = value.strip()
+    if not value:
+        return EPOCH
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc).isoformat()
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc).isoformat()
+    except (TypeError, ValueError):
+        return EPOCH
+
+
+def random_url(rng: random.Random) -> str:
+    scheme = rng.choice(("https", "http", "HTTPS", ""))
+    host = rng.choice(("d2.naver.com", "Medium.COM", "toss.tech", ""))
+    path = "".join(rng.choice(("/", "//", "/blog", "/글", "/a-b", "/%20", "/.")) for _ in range(rng.randint(0, 5)))
+    suffix = rng.choice(("", "?utm_source=rss", "#top", "?a=1#b", ";p"))
+    padding = rng.choice(("", " ", "\n", "\t "))
+    return f"{padding}{scheme}{'://' if scheme else ''}{host}{path}{suffix}{padding}"
+
+
+def random_date(rng: random.Random) -> str | None:
+    moment = datetime(2015, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randint(0, 400_000_000))
+    offset = timezone(timedelta(minutes=rng.choice((0, 540, -300, 330))))
+    local = moment.astimezone(offset)
+    shapes = (
+        lambda: local.isoformat(),
+        lambda: moment.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        lambda: local.strftime("%Y-%m-%dT%H:%M:%S"),
+        lambda: local.strftime("%Y-%m-%d"),
+        lambda: format_datetime(local),
+        lambda: format_datetime(moment, usegmt=True),
+        lambda: local.strftime("%d %b %Y %H:%M %z"),
+        lambda: local.strftime("%a, %d %b %Y %H:%M:%S UT"),
+        lambda: local.strftime("%a, %d %b %Y %H:%M:%S EST"),
+        lambda: local.strftime("%a, %d %b %Y"),
+        lambda: rng.choice(("", "   ", "not a date", "2025-13-40", "Mon, 32 Foo 2025 10:00:00 GMT")),
+        lambda: None,
+    )
+    value = rng.choice(shapes)()
+    return f" {value} " if value and rng.random() < 0.2 else value
+
+
+def check_normalizers(rounds: int, seed: int = 0) -> CheckResult:
+    rng = random.Random(seed)
+    result = CheckResult("normalize_url, to_iso_datetime", rounds * 2)
+    for case in range(rounds):
+        url = random_url(rng)
+        # Twice, so the second call is answered from the memo.
+        if not normalize_url(url) == normalize_url(url) == reference_normalize_url(url):
+            result.mismatches.append(f"normalize_url({url!r}) = {normalize_url(url)!r}, was {reference_normalize_url(url)!r}")
+        value = random_date(rng)
+        if not to_iso_datetime(value) == to_iso_datetime(value) == reference_to_iso_datetime(value):
+            result.mismatches.append(
+                f"to_iso_datetime({value!r}) = {to_iso_datetime(value)!r}, was {reference_to_iso_datetime(value)!r}"
+            )
+    return result
+
+
+# --- regressions ---------------------------------------------------------------
+
+_TERMS = [f"term{index}" for index in range(40)]
+
+
+def keyword_records(rng: random.Random, count: int, start: int = 0) -> list[tuple[Record, dict[str, int]]]:
+    return [
+        (
+            Record(
+                company=rng.choice(["NAVER", "KAKAO", "LINE"]),
+                source="mock",
+                title=f"post {index}",
+                link=f"https://example.com/post/{index}",
+                date="2025-01-01T00:00:00+00:00",
+                topic="other",
+                tags=[],
+                evidence=f"case {index}",
+            ),
+            {term: rng.randint(1, 5) for term in rng.sample(_TERMS, rng.randint(1, 12))},
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def rank_keywords(records: list[tuple[Record, dict[str, int]]]) -> None:
+    """Fill `top_keywords` the way the builder does: TF-IDF across the whole selection when available.
+
+    Rows are hashed as they are written, so re-ranking for the next build leaves earlier snapshots alone.
+    """
+    counts = [term_counts for _, term_counts in records]
+    if tfidf.available():
+        keywords = tfidf.TfidfModel(counts).top_terms(5)
+    else:
+        keywords = [sorted(term_counts, key=term_counts.get, reverse=True)[:5] for term_counts in counts]
+    for (record, _), top_keywords in zip(records, keywords):
+        record.top_keywords = top_keywords
+
+
+def check_snapshot_recomputed(rounds: int, seed: int = 0) -> CheckResult:
+    """Adding one record to a NEKARACUBA build must list the others as recomputed at most, never modified."""
+    rng = random.Random(seed)
+    cases = max(rounds // 50, 1)
+    result = CheckResult("corpus snapshot: one row added", cases)
+    for case in range(cases):
+        records = keyword_records(rng, rng.randint(2, 40))
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SnapshotStore(Path(tmp), "nekaracuba")
+            for build in (records, records + keyword_records(rng, 1, start=len(records))):
+                rank_keywords(build)
+                with snapshot_sink(store, Path(tmp) / "changes.jsonl") as snapshot:
+                    for record, _ in build:
+                        snapshot.write(record_row(record))
+        diff = snapshot.diff
+        if (diff.added, diff.removed, diff.modified) != (1, 0, 0):
+            result.mismatches.append(
+                f"case {case}: +{diff.added} -{diff.removed} ~{diff.modified} recomputed {diff.recomputed}, "
+                "expected +1 -0 ~0"
+            )
+    return result
+
+
+def check_small_corpus_tfidf(rounds: int, seed: int = 0) -> CheckResult:
+    """The Toss TF-IDF stage must handle corpora of zero to a few rows, as after every download failed."""
+    rng = random.Random(seed)
+    sizes = [0, 1, 2] if tfidf.available() else []
+    result = CheckResult("toss tfidf: empty and tiny corpora", len(sizes))
+    for size in sizes:
+        rows = [
+            {
+                "url": f"https://toss.tech/article/{index}",
+                "category_scores": {category: rng.randint(0, 3) for category in KEYWORDS},
+                "top_keywords": [],
+            }
+            for index in range(size)
+        ]
+        term_counts = {row["url"]: {term: 1 for term in rng.sample(_TERMS, 3)} for row in rows}
+        summary = SummaryTotals().to_summary()
+        try:
+            apply_tfidf(rows, term_counts, summary)
+        except Exception as exc:  # any crash is the regression
+            result.mismatches.append(f"{size} rows: {type(exc).__name__}: {exc}")
+            continue
+        if set(summary["category_term_weights"]) != set(KEYWORDS):
+            result.mismatches.append(f"{size} rows: categories {sorted(summary['category_term_weights'])}")
+    return result
+
+
+_CLUSTER_TITLES = (
+    "Migrating our design system to tokens",
+    "How we cut build times in half",
+    "Scaling search ranking with learned features",
+    "Lessons from a year of on-call rotations",
+    "Building a payments ledger that never loses money",
+)
+
+
+def check_near_duplicate_order(rounds: int, seed: int = 0) -> CheckResult:
+    """Of titles shared across companies, selection must keep the first company's copy, ordered source or not."""
+    rng = random.Random(seed)
+    cases = max(rounds // 10, 1)
+    result = CheckResult("near-duplicates: first company kept", cases)
+    for case in range(cases):
+        companies = rng.sample(["NAVER", "KAKAO", "LINE", "COUPANG", "BAEMIN"], rng.randint(2, 5))
+        ordered_names = [company for company in companies if rng.random() < 0.5]
+        company_map = {
+            company: sort_records(
+                [
+                    Record(
+                        company=company,
+                        source=company,
+                        title=title,
+                        link=f"https://{company.lower()}.example/{index}",
+                        date=f"2025-{rng.randint(1, 12):02d}-01T00:00:00+00:00",
+                        topic="other",
+                        tags=[],
+                        evidence="",
+                    )
+                    for index, title in enumerate(_CLUSTER_TITLES)
+                    if rng.random() < 0.6
+                ]
+            )
+            for company in companies
+        }
+        expected = {}
+        for company, records in company_map.items():
+            for record in records:
+                expected.setdefault(record.title, company)
+        index = NearDuplicateIndex()
+        sources = {company: near_unique(iter(records), index) for company, records in company_map.items()}
+        quotas = {company: 1 for company in companies}
+        # A target above the record count keeps every record, so only the cluster choice decides the result.
+        selected = select_records(sources, quotas, ordered=ordered_names, target=len(_CLUSTER_TITLES) * len(companies))
+        actual = {record.title: record.company for record in selected}
+        if actual != expected:
+            result.mismatches.append(f"case {case} (ordered={ordered_names}): kept {actual}, expected {expected}")
+    return result
+
+
+CHECKS: dict[str, Callable[[int, int], CheckResult]] = {
+    "selection": check_selection,
+    "extract": check_extractors,
+    "normalize": check_normalizers,
+    "snapshot": check_snapshot_recomputed,
+    "tfidf": check_small_corpus_tfidf,
+    "near-dupes": check_near_duplicate_order,
+}
+
+
+def run_checks(rounds: int = DEFAULT_ROUNDS, seed: int = 0, only: Iterable[str] = ()) -> list[CheckResult]:
+    filters = list(only)
+    return [
+        check(rounds, seed)
+        for name, check in CHECKS.items()
+        if not filters or any(pattern in name for pattern in filters)
+    ]
+
+
+def format_checks(results: list[CheckResult]) -> str:
+    lines = []
+    for result in results:
+        status = "ok" if result.ok else f"{len(result.mismatches)} MISMATCHES"
+        lines.append(f"{result.name:<40} {result.cases:>7} cases  {status}")
+        lines += [f"  {mismatch}" for mismatch in result.mismatches[:SHOWN_MISMATCHES]]
+    return "\n".join(lines)
@@ -3,21 +3,58 @@
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import multiprocessing
+import os
+import queue
 import re
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from contextlib import nullcontext
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
 import requests
-from bs4 import BeautifulSoup
+
+from adaptive_concurrency import MAX_ATTEMPTS, MAX_CONCURRENCY, AdaptiveLimiter
+from columnar import FORMATS, ColumnarSink, columnar_path
+from fetch_engine import MAX_WORKERS
+from http_cache import add_cache_arguments, cache_from_args
+from html_extract import PARSERS, extract_page
+from http_client import HttpClient, add_client_arguments
+from instrumentation import METRICS, add_instrumentation_arguments, profiling
+from jsonl_sink import COMPRESSIONS, JsonlSink, iter_jsonl, output_path, write_text_atomic
+from keyword_index import MATCHER, KeywordIndex, matcher_notice
+from normalize import normalize_url, tokenize
+from snapshots import SnapshotSink, add_snapshot_arguments, changes_path, snapshot_store_from_args
+from tokenizer import TOKENIZERS, get_tokenizer
 
 ROOT = Path(__file__).resolve().parents[2]
 CORPUS_MD = ROOT / "docs/research/toss/toss-uiux-fe-ds-article-corpus.md"
 OUT_JSONL = ROOT / "docs/research/toss/toss-uiux-fe-ds-analysis-data.jsonl"
 OUT_SUMMARY = ROOT / "docs/research/toss/toss-uiux-fe-ds-analysis-summary.json"
+# Per-article term counts; incremental runs need them to recompute corpus-wide TF-IDF.
+OUT_TERMS = output_path(ROOT / "docs/research/toss/toss-uiux-fe-ds-analysis-terms.jsonl", "gzip")
+OUT_REPORT = ROOT / "docs/research/toss/toss-uiux-fe-ds-analysis-run-report.json"
+OUT_CHANGES = changes_path(OUT_JSONL)
+SNAPSHOT_NAME = "toss"
+# Row columns computed from the whole corpus (TF-IDF) rather than from the article itself.
+CORPUS_DERIVED_COLUMNS = ("top_keywords",)
+
+TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0"
+
+CPU_WORKERS = os.cpu_count() or 1
+ANALYSIS_QUEUE_SIZE = 64
+IO_CONCURRENCY = ("adaptive", "fixed")
+TOP_KEYWORDS = 12
+CATEGORY_TERMS = 20
 
 KEYWORDS = {
     "uiux": [
@@ -67,8 +104,10 @@ KEYWORDS = {
     ],
 }
 
+KEYWORD_INDEX = KeywordIndex(KEYWORDS)
 
-@dataclass
+
+@dataclass(slots=True)
 class ArticleRecord:
     url: str
     title: str
@@ -76,104 +115,526 @@ class ArticleRecord:
     category_scores: dict[str, int]
     top_keywords: list[str]
     excerpt: str
+    content_hash: str = ""
+    term_counts: dict[str, int] = field(default_factory=dict)
 
+    def row(self) -> dict:
+        # term_counts feeds the corpus-level TF-IDF and is stored separately.
+        return {name: getattr(self, name) for name in self.__slots__ if name != "term_counts"}
 
-def extract_urls(markdown: str) -> list[str]:
-    return sorted(set(re.findall(r"https://toss\.tech/article/[A-Za-z0-9_-]+", markdown)))
 
+@dataclass
+class SummaryTotals:
+    article_count: int = 0
+    category_totals: dict[str, int] = field(default_factory=lambda: {key: 0 for key in KEYWORDS})
+    word_count_total: int = 0
+    max_word_count: int = 0
+    min_word_count: int = 0
+    bounds_stale: bool = False
 
-def tokenize(text: str) -> list[str]:
-    # Keep English words and Korean blocks.
-    return re.findall(r"[A-Za-z][A-Za-z0-9_-]{2,}|[가-힣]{2,}", text)
+    @classmethod
+    def from_summary(cls, summary: dict) -> SummaryTotals:
+        return cls(
+            article_count=summary["article_count"],
+            category_totals={key: summary["category_totals"].get(key, 0) for key in KEYWORDS},
+            word_count_total=summary["word_count_total"],
+            max_word_count=summary["max_word_count"],
+            min_word_count=summary["min_word_count"],
+        )
 
+    def add(self, row: dict) -> None:
+        word_count = row["word_count"]
+        if self.article_count == 0:
+            self.max_word_count = self.min_word_count = word_count
+        else:
+            self.max_word_count = max(self.max_word_count, word_count)
+            self.min_word_count = min(self.min_word_count, word_count)
+        self.article_count += 1
+        self.word_count_total += word_count
+        for cat, score in row["category_scores"].items():
+            self.category_totals[cat] = self.category_totals.get(cat, 0) + score
 
-def fetch_article(url: str) -> ArticleRecord | None:
+    def remove(self, row: dict) -> None:
+        word_count = row["word_count"]
+        self.article_count -= 1
+        self.word_count_total -= word_count
+        for cat, score in row["category_scores"].items():
+            self.category_totals[cat] = self.category_totals.get(cat, 0) - score
+        # Min/max can't be undone from totals alone; rescan word counts only if a bound left.
+        if word_count in (self.max_word_count, self.min_word_count):
+            self.bounds_stale = True
+
+    def refresh_bounds(self, rows: Iterable[dict]) -> None:
+        word_counts = [row["word_count"] for row in rows]
+        self.max_word_count = max(word_counts, default=0)
+        self.min_word_count = min(word_counts, default=0)
+        self.bounds_stale = False
+
+    def to_summary(self) -> dict:
+        return {
+            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "article_count": self.article_count,
+            "category_totals": self.category_totals,
+            "avg_word_count": round(self.word_count_total / max(1, self.article_count), 2),
+            "max_word_count": self.max_word_count,
+            "min_word_count": self.min_word_count,
+            "word_count_total": self.word_count_total,
+        }
+
+
+def extract_urls(markdown: str) -> list[str]:
+    return sorted(set(re.findall(r"https://toss\.tech/article/[A-Za-z0-9_-]+", markdown)))
+
+
+def download_article(
+    client: HttpClient, url: str, limiter: AdaptiveLimiter | None = None
+) -> tuple[str, str] | None:
     try:
-        resp = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
+        resp = limiter.get(client, url) if limiter is not None else client.get(url)
     except requests.RequestException:
         return None
     if resp.status_code != 200:
         return None
+    return resp.text, hashlib.sha256(resp.content).hexdigest()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    title = ""
-    if soup.find("h1"):
-        title = soup.find("h1").get_text(" ", strip=True)
-    elif soup.title:
-        title = soup.title.get_text(" ", strip=True)
 
-    article_node = soup.find("article")
-    full_text = article_node.get_text(" ", strip=True) if article_node else soup.get_text(" ", strip=True)
-    normalized = re.sub(r"\s+", " ", full_text).strip()
-    words = tokenize(normalized)
-    lowered = normalized.lower()
+def analyse_article(
+    url: str, html: str, content_hash: str = "", parser: str = "auto", tokenizer: str = "ko-en"
+) -> ArticleRecord:
+    page = extract_page(html, parser)
+    normalize = get_tokenizer(tokenizer).normalize
+    lowered = page.text.lower()
 
-    scores: dict[str, int] = {}
-    for category, kws in KEYWORDS.items():
-        scores[category] = sum(1 for kw in kws if kw in lowered)
+    scores = KEYWORD_INDEX.score(lowered)
 
+    # Tokens never span text nodes, so each chunk is tokenized as it comes.
+    word_count = 0
+    excerpt_words: list[str] = []
     token_freq: dict[str, int] = {}
-    for token in words:
-        key = token.lower()
-        if len(key) < 3:
-            continue
-        token_freq[key] = token_freq.get(key, 0) + 1
+    for chunk in page.chunks:
+        for token in tokenize(chunk):
+            word_count += 1
+            if len(excerpt_words) < 120:
+                excerpt_words.append(token)
+            key = normalize(token)
+            if len(key) < 3:
+                continue
+            token_freq[key] = token_freq.get(key, 0) + 1
 
-    top_keywords = [k for k, _ in sorted(token_freq.items(), key=lambda item: item[1], reverse=True)[:12]]
-    excerpt = " ".join(words[:120])
+    # Frequency ranking is the fallback; apply_tfidf replaces it with corpus-level weights.
+    top_keywords = [k for k, _ in sorted(token_freq.items(), key=lambda item: item[1], reverse=True)[:TOP_KEYWORDS]]
+    excerpt = " ".join(excerpt_words)
 
     return ArticleRecord(
         url=url,
-        title=title,
-        word_count=len(words),
+        title=page.title,
+        word_count=word_count,
         category_scores=scores,
         top_keywords=top_keywords,
         excerpt=excerpt,
+        content_hash=content_hash,
+        term_counts=token_freq,
     )
 
 
-def generate(records: Iterable[ArticleRecord]) -> tuple[list[dict], dict]:
-    rows = [r.__dict__ for r in records]
-    category_totals: dict[str, int] = {key: 0 for key in KEYWORDS}
-    for row in rows:
-        for cat, score in row["category_scores"].items():
-            category_totals[cat] += score
-
-    summary = {
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
-        "article_count": len(rows),
-        "category_totals": category_totals,
-        "avg_word_count": round(sum(r["word_count"] for r in rows) / max(1, len(rows)), 2),
-        "max_word_count": max((r["word_count"] for r in rows), default=0),
-        "min_word_count": min((r["word_count"] for r in rows), default=0),
-    }
-    return rows, summary
+def fetch_article(
+    client: HttpClient, url: str, parser: str = "auto", tokenizer: str = "ko-en"
+) -> ArticleRecord | None:
+    downloaded = download_article(client, url)
+    if downloaded is None:
+        return None
+    html, content_hash = downloaded
+    return analyse_article(url, html, content_hash, parser, tokenizer)
+
+
+def generate(records: Iterable[ArticleRecord], totals: SummaryTotals) -> Iterator[dict]:
+    for record in records:
+        row = record.row()
+        totals.add(row)
+        yield row
+
+
+def generate_incremental(
+    existing: dict[str, dict],
+    previous_summary: dict,
+    changed: Iterable[ArticleRecord],
+    removed_urls: Iterable[str],
+) -> tuple[list[dict], dict]:
+    rows_by_url = dict(existing)
+    if "word_count_total" in previous_summary:
+        totals = SummaryTotals.from_summary(previous_summary)
+    else:
+        totals = SummaryTotals()
+        for row in rows_by_url.values():
+            totals.add(row)
+
+    for url in removed_urls:
+        totals.remove(rows_by_url.pop(url))
+    for record in changed:
+        row = record.row()
+        if record.url in rows_by_url:
+            totals.remove(rows_by_url[record.url])
+        rows_by_url[record.url] = row
+        totals.add(row)
+    if totals.bounds_stale:
+        totals.refresh_bounds(rows_by_url.values())
+
+    return [rows_by_url[url] for url in sorted(rows_by_url)], totals.to_summary()
+
+
+def load_rows(path: Path) -> dict[str, dict]:
+    return {row["url"]: row for row in iter_jsonl(path)}
+
+
+def load_term_counts(path: Path) -> dict[str, dict[str, int]]:
+    return {row["url"]: row["terms"] for row in iter_jsonl(path)}
+
+
+def apply_tfidf(rows: list[dict], term_counts: dict[str, dict[str, int]], summary: dict) -> None:
+    """Re-rank every row's top_keywords by TF-IDF and add per-category term weights to the summary."""
+    import tfidf
+
+    model = tfidf.TfidfModel([term_counts.get(row["url"], {}) for row in rows])
+    for row, keywords in zip(rows, model.top_terms(TOP_KEYWORDS)):
+        row["top_keywords"] = keywords
+    summary["category_term_weights"] = model.category_term_weights(
+        [row["category_scores"] for row in rows], list(KEYWORDS), CATEGORY_TERMS
+    )
+
+
+def _analyse_timed(
+    url: str, html: str, content_hash: str, parser: str, tokenizer: str
+) -> tuple[ArticleRecord, float]:
+    # Analysis processes have their own METRICS, so the time travels back with the record.
+    start = time.perf_counter()
+    record = analyse_article(url, html, content_hash, parser, tokenizer)
+    return record, time.perf_counter() - start
+
+
+def _download_into(
+    client: HttpClient, index: int, url: str, handoff: queue.Queue, limiter: AdaptiveLimiter | None = None
+) -> None:
+    try:
+        downloaded = download_article(client, url, limiter)
+        if downloaded is None:
+            METRICS.incr("articles.download_failed")
+        handoff.put((index, url, downloaded, None))
+    except BaseException as exc:
+        handoff.put((index, url, None, exc))
+
+
+def analyse_pipeline(
+    client: HttpClient,
+    urls: list[str],
+    io_workers: int = MAX_WORKERS,
+    cpu_workers: int = CPU_WORKERS,
+    parser: str = "auto",
+    skip: Callable[[str, str], bool] | None = None,
+    tokenizer: str = "ko-en",
+    queue_size: int = ANALYSIS_QUEUE_SIZE,
+    limiter: AdaptiveLimiter | None = None,
+) -> Iterator[ArticleRecord]:
+    """Download on threads and analyse on processes, yielding records in URL order.
+
+    Downloads block on a bounded handoff queue, at most `queue_size`
+    analyses are in flight, and downloads are submitted only while they are
+    fewer than `max(queue_size, io_workers)` URLs ahead of the next one to
+    yield, so memory stays flat however slow a single article is. Failed
+    downloads and URLs for which `skip(url, content_hash)` is true are
+    left out. `cpu_workers=0` analyses inline on the calling thread. With a
+    `limiter`, `io_workers` is only the ceiling: each host's limit decides
+    how many downloads run at once, and throttled ones are re-queued.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=queue_size)
+    in_flight = threading.BoundedSemaphore(queue_size)
+    # Out-of-order results wait here until every earlier URL has been yielded.
+    results: dict[int, Future | tuple[ArticleRecord, float] | None] = {}
+    window = max(queue_size, io_workers)
+    next_index = 0
+    submitted = 0
+    pending = 0
+
+    def ready(index: int) -> bool:
+        result = results.get(index, False)
+        return result is not False and not (isinstance(result, Future) and not result.done())
+
+    def pop_result(index: int) -> ArticleRecord | None:
+        result = results.pop(index)
+        if isinstance(result, Future):
+            result = result.result()
+        if result is None:
+            return None
+        record, seconds = result
+        METRICS.observe("parse", "analyse_article", seconds)
+        METRICS.incr("articles.analysed")
+        return record
+
+    cpu_pool = (
+        ProcessPoolExecutor(max_workers=cpu_workers, mp_context=multiprocessing.get_context("spawn"))
+        if cpu_workers > 0
+        else None
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+
+            def submit_more() -> None:
+                nonlocal submitted, pending
+                while submitted < len(urls) and submitted - next_index < window:
+                    io_pool.submit(_download_into, client, submitted, urls[submitted], handoff, limiter)
+                    submitted += 1
+                    pending += 1
+
+            failure: BaseException | None = None
+            submit_more()
+            try:
+                while pending:
+                    index, url, downloaded, error = handoff.get()
+                    pending -= 1
+                    # Keep draining after a failure so no downloader blocks on a full queue.
+                    failure = failure or error
+                    results[index] = None
+                    if failure is not None:
+                        continue
+                    if downloaded is not None and skip is not None and skip(url, downloaded[1]):
+                        METRICS.incr("articles.unchanged")
+                    elif downloaded is not None:
+                        html, content_hash = downloaded
+                        if cpu_pool is None:
+                            results[index] = _analyse_timed(url, html, content_hash, parser, tokenizer)
+                        else:
+                            in_flight.acquire()
+                            future = cpu_pool.submit(_analyse_timed, url, html, content_hash, parser, tokenizer)
+                            future.add_done_callback(lambda _: in_flight.release())
+                            results[index] = future
+                    # With no download outstanding, wait on the head analysis so the window can move on.
+                    while ready(next_index) or (not pending and next_index in results):
+                        record = pop_result(next_index)
+                        next_index += 1
+                        if record is not None:
+                            yield record
+                    submit_more()
+            finally:
+                # A consumer that stops early must still unblock the downloaders.
+                for _ in range(pending):
+                    handoff.get()
+
+        if failure is not None:
+            raise failure
+        while next_index in results:
+            record = pop_result(next_index)
+            next_index += 1
+            if record is not None:
+                yield record
+    finally:
+        if cpu_pool is not None:
+            cpu_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=CORPUS_MD,
+        help="markdown listing the toss.tech article URLs to analyse",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="reuse rows from the existing JSONL and only analyse new or changed articles",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=PARSERS,
+        default="auto",
+        help="auto uses lxml when installed, then the stdlib streaming parser; bs4 is the old tree parser",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=TOKENIZERS,
+        default="ko-en",
+        help="ko-en strips Korean particles/endings and folds English plurals; regex only lowercases",
+    )
+    parser.add_argument(
+        "--io-concurrency",
+        choices=IO_CONCURRENCY,
+        default="adaptive",
+        help="adaptive tunes concurrent downloads per host from its latency and 429/5xx responses (AIMD)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=MAX_WORKERS,
+        help="download threads; with adaptive concurrency, the starting limit per host",
+    )
+    parser.add_argument(
+        "--max-io-workers",
+        type=int,
+        default=MAX_CONCURRENCY,
+        help="ceiling for adaptive concurrency",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=MAX_ATTEMPTS,
+        help="tries per article before a throttled download is given up (adaptive only)",
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=CPU_WORKERS,
+        help="analysis processes (0 analyses on the main thread)",
+    )
+    parser.add_argument("--compress", choices=COMPRESSIONS, default="none", help="compress the JSONL output")
+    parser.add_argument(
+        "--columnar",
+        choices=FORMATS,
+        default="none",
+        help="also write a Parquet or Arrow copy of the rows for query_corpus.py",
+    )
+    add_snapshot_arguments(parser)
+    add_client_arguments(parser)
+    add_cache_arguments(parser)
+    add_instrumentation_arguments(parser)
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
+
+def connection_pool_size(args: argparse.Namespace) -> int:
+    """Download threads, which is also how many connections to the host can be open at once."""
+    if args.io_concurrency == "adaptive":
+        return max(args.io_workers, args.max_io_workers)
+    return args.io_workers
 
 
-def main() -> None:
-    corpus = CORPUS_MD.read_text(encoding="utf-8")
+def build(args: argparse.Namespace, client: HttpClient | None = None) -> dict:
+    """Analyse the corpus and write the dataset; a caller-supplied `client` is shared and left open."""
+    corpus = args.corpus.read_text(encoding="utf-8")
     urls = extract_urls(corpus)
     print(f"input URLs: {len(urls)}")
+    if notice := matcher_notice():
+        print(notice)
 
-    records: list[ArticleRecord] = []
-    with ThreadPoolExecutor(max_workers=16) as executor:
-        for result in executor.map(fetch_article, urls):
-            if result:
-                records.append(result)
+    limiter = None
+    io_workers = connection_pool_size(args)
+    if args.io_concurrency == "adaptive":
+        limiter = AdaptiveLimiter(initial=args.io_workers, maximum=io_workers, max_attempts=args.max_attempts)
 
-    rows, summary = generate(records)
-    rows.sort(key=lambda row: row["url"])
+    owns_client = client is None
+    if client is None:
+        client = HttpClient(
+            user_agent=USER_AGENT,
+            timeout=TIMEOUT,
+            pool_size=io_workers,
+            cache=cache_from_args(args),
+            offline=args.offline,
+            per_host_requests_per_second=args.per_host_requests_per_second,
+            base_url=args.base_url,
+        )
+    run_pipeline = partial(
+        analyse_pipeline,
+        client,
+        io_workers=io_workers,
+        cpu_workers=args.cpu_workers,
+        parser=args.html_parser,
+        tokenizer=args.tokenizer,
+        limiter=limiter,
+    )
+    out_jsonl = output_path(OUT_JSONL, args.compress)
+    incremental = args.incremental and out_jsonl.exists() and OUT_SUMMARY.exists() and OUT_TERMS.exists()
+    pipeline_started = time.perf_counter()
+    with METRICS.stage("pipeline"), client if owns_client else nullcontext():
+        if incremental:
+            existing = load_rows(out_jsonl)
+            term_counts = load_term_counts(OUT_TERMS)
+            removed_urls = set(existing) - set(urls)
+
+            def unchanged(url: str, content_hash: str) -> bool:
+                # A failed download never reaches here, so its previous row is kept.
+                return existing.get(url, {}).get("content_hash") == content_hash
+
+            changed = list(run_pipeline(urls, skip=unchanged))
+            analysed = len(changed)
+            previous_summary = json.loads(OUT_SUMMARY.read_text(encoding="utf-8"))
+            rows, summary = generate_incremental(existing, previous_summary, changed, removed_urls)
+            term_counts.update((record.url, record.term_counts) for record in changed)
+            print(f"changed: {len(changed)}, removed: {len(removed_urls)}")
+        else:
+            # extract_urls is sorted and the pipeline keeps that order.
+            totals = SummaryTotals()
+            records = list(run_pipeline(urls))
+            analysed = len(records)
+            rows = list(generate(records, totals))
+            term_counts = {record.url: record.term_counts for record in records}
+            summary = totals.to_summary()
+    pipeline_seconds = time.perf_counter() - pipeline_started
 
-    with OUT_JSONL.open("w", encoding="utf-8") as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    # TF-IDF needs document frequencies from the whole corpus, so it runs once all rows are in.
+    # numpy/scipy are imported here rather than at startup.
+    import tfidf
 
-    OUT_SUMMARY.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    if tfidf.available():
+        with METRICS.stage("tfidf"):
+            apply_tfidf(rows, term_counts, summary)
+    else:
+        print("numpy/scipy not installed: top_keywords stay frequency-ranked")
+
+    out_table = columnar_path(OUT_JSONL, args.columnar)
+    # Keyed by normalized URL; the snapshot is only committed once every output is written.
+    # TF-IDF keywords move whenever the corpus does, so they are not counted as article changes.
+    snapshot = SnapshotSink(
+        snapshot_store_from_args(args, SNAPSHOT_NAME),
+        OUT_CHANGES,
+        key=lambda row: normalize_url(row["url"]),
+        derived=CORPUS_DERIVED_COLUMNS,
+    )
+    with METRICS.stage("write"), snapshot:
+        with JsonlSink(out_jsonl, args.compress) as sink, ColumnarSink(out_table, args.columnar) as table_sink:
+            for row in rows:
+                sink.write(row)
+                table_sink.write(row)
+                snapshot.write(row)
+        with JsonlSink(OUT_TERMS, "gzip") as terms_sink:
+            for row in rows:
+                terms_sink.write({"url": row["url"], "terms": term_counts.get(row["url"], {})})
+        write_text_atomic(OUT_SUMMARY, json.dumps(summary, ensure_ascii=False, indent=2))
 
-    print(f"saved: {OUT_JSONL}")
+    print(f"saved: {out_jsonl}")
+    if args.columnar != "none":
+        print(f"saved: {out_table}")
     print(f"saved: {OUT_SUMMARY}")
+    if snapshot.diff is not None:
+        print(f"saved: {OUT_CHANGES}")
+        diff = snapshot.diff
+        print(
+            f"changes: +{diff.added} -{diff.removed} ~{diff.modified}, "
+            f"keywords recomputed: {diff.recomputed} (snapshot {diff.snapshot[:12]})"
+        )
     print(f"processed: {summary['article_count']}")
 
+    return {
+        "input_urls": len(urls),
+        "articles": summary["article_count"],
+        "pipeline_articles_per_second": round(analysed / pipeline_seconds, 1) if pipeline_seconds else 0.0,
+        "keyword_matcher": MATCHER,
+        **(snapshot.diff.stats() if snapshot.diff is not None else {}),
+        **({"io_concurrency": limiter.stats()} if limiter is not None else {}),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    METRICS.reset()
+    with profiling(args) as profile:
+        stats = build(args)
+    report_path = args.report or OUT_REPORT
+    report = METRICS.report(**stats, **profile)
+    write_text_atomic(report_path, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    print(f"saved: {report_path}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+"""Single-pass article extraction without building a DOM.
+
+The streaming handler mirrors what `fetch_article` used to read from a full
+BeautifulSoup tree: the first `<h1>` (falling back to `<title>`) and the text
+of the first `<article>` (falling back to the whole document), with each text
+node stripped and joined by single spaces.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Iterator
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is an optional fast path
+    etree = None
+
+_LXML_ERRORS: tuple[type[Exception], ...] = (etree.LxmlError,) if etree is not None else ()
+
+PARSERS = ("auto", "lxml", "stdlib", "bs4")
+SKIPPED_TAGS = frozenset({"script", "style", "template"})
+
+
+@dataclass
+class ExtractedPage:
+    title: str
+    chunks: list[str]
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.chunks)
+
+
+class _ArticleHandler:
+    """Parser-target callbacks shared by the stdlib and lxml backends."""
+
+    def __init__(self) -> None:
+        self._pending: list[str] = []
+        self._skip_depth = 0
+        self._article_depth = 0
+        self._article_seen = False
+        self._h1_depth = 0
+        self._h1_seen = False
+        self._h1_done = False
+        self._title_depth = 0
+        self._title_done = False
+        self.h1_chunks: list[str] = []
+        self.title_chunks: list[str] = []
+        self.document_chunks: list[str] = []
+        self.article_chunks: list[str] = []
+
+    def start(self, tag: str, attrs: object = None) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "article" and (self._article_depth or not self._article_seen):
+            self._article_depth += 1
+            self._article_seen = True
+        elif tag == "h1" and not self._h1_done:
+            self._h1_depth += 1
+            self._h1_seen = True
+        elif tag == "title" and not self._title_done:
+            self._title_depth += 1
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "article" and self._article_depth:
+            self._article_depth -= 1
+        elif tag == "h1" and self._h1_depth:
+            self._h1_depth -= 1
+            self._h1_done = not self._h1_depth
+        elif tag == "title" and self._title_depth:
+            self._title_depth -= 1
+            self._title_done = not self._title_depth
+
+    def data(self, text: str) -> None:
+        self._pending.append(text)
+
+    def comment(self, text: str = "") -> None:
+        # bs4 leaves comments out of the text but they still end a string, so
+        # "foo<!-- c -->bar" reads as "foo bar". Declarations and PIs do the same.
+        self._flush()
+
+    def pi(self, target: str = "", data: str = "") -> None:
+        self._flush()
+
+    def doctype(self, *args: object) -> None:
+        self._flush()
+
+    def cdata(self, text: str) -> None:
+        self._flush()
+        self._pending.append(text)
+        self._flush()
+
+    def close(self) -> ExtractedPage:
+        self._flush()
+        title_chunks = self.h1_chunks if self._h1_seen else self.title_chunks
+        chunks = self.article_chunks if self._article_seen else self.document_chunks
+        return ExtractedPage(title=" ".join(title_chunks), chunks=chunks)
+
+    def _flush(self) -> None:
+        # Backends may split one text node across several data() calls.
+        if not self._pending:
+            return
+        stripped = "".join(self._pending).strip()
+        self._pending.clear()
+        if not stripped or self._skip_depth:
+            return
+        if self._h1_depth:
+            self.h1_chunks.append(stripped)
+        if self._title_depth:
+            self.title_chunks.append(stripped)
+        normalized = " ".join(stripped.split())
+        if self._article_depth:
+            self.article_chunks.append(normalized)
+        elif not self._article_seen:
+            self.document_chunks.append(normalized)
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, handler: _ArticleHandler) -> None:
+        super().__init__(convert_charrefs=True)
+        self.handler = handler
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handler.start(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.handler.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.handler.data(data)
+
+    def handle_comment(self, data: str) -> None:
+        self.handler.comment(data)
+
+    def handle_decl(self, decl: str) -> None:
+        self.handler.doctype(decl)
+
+    def handle_pi(self, data: str) -> None:
+        self.handler.pi(data)
+
+    def unknown_decl(self, data: str) -> None:
+        if data.startswith("CDATA["):
+            self.handler.cdata(data[len("CDATA[") :])
+        else:
+            self.handler.doctype(data)
+
+
+def _iter_chunks(html: str, size: int = 64 * 1024) -> Iterator[str]:
+    for offset in range(0, len(html), size):
+        yield html[offset : offset + size]
+
+
+def extract_streaming(html: str) -> ExtractedPage:
+    handler = _ArticleHandler()
+    parser = _StdlibParser(handler)
+    for chunk in _iter_chunks(html):
+        parser.feed(chunk)
+    parser.close()
+    return handler.close()
+
+
+def extract_lxml(html: str) -> ExtractedPage:
+    if etree is None:
+        raise RuntimeError("lxml is not installed")
+    parser = etree.HTMLParser(target=_ArticleHandler())
+    for chunk in _iter_chunks(html):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def extract_bs4(html: str) -> ExtractedPage:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = ""
+    if soup.find("h1"):
+        title = soup.find("h1").get_text(" ", strip=True)
+    elif soup.title:
+        title = soup.title.get_text(" ", strip=True)
+
+    article_node = soup.find("article")
+    node = article_node if article_node else soup
+    return ExtractedPage(title=title, chunks=[" ".join(text.split()) for text in node.stripped_strings])
+
+
+def extract_page(html: str, parser: str = "auto") -> ExtractedPage:
+    if parser == "bs4":
+        return extract_bs4(html)
+    if parser == "lxml" or (parser == "auto" and etree is not None):
+        try:
+            return extract_lxml(html)
+        except (RuntimeError, ValueError, *_LXML_ERRORS):
+            if parser == "lxml":
+                raise
+    try:
+        return extract_streaming(html)
+    except (AssertionError, ValueError):
+        return extract_bs4(html)
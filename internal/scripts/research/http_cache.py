@@ -0,0 +1,200 @@
+"""On-disk HTTP response cache with conditional-GET revalidation."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from normalize import normalize_url
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / ".cache/research/http"
+
+DEFAULT_TTL = 3600.0
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+def cache_key(url: str) -> str:
+    # normalize_url drops the query, but paged APIs need it to tell pages apart.
+    query = urlparse(url.strip()).query
+    key = normalize_url(url)
+    if query:
+        key = f"{key}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+    return key
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    stored_at: float
+    headers: Mapping[str, str]
+    encoding: str | None
+    body: bytes
+
+    def __post_init__(self) -> None:
+        # Header names are case-insensitive, and HTTP/2 servers send them lowercase.
+        self.headers = CaseInsensitiveDict(self.headers)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time.time() - self.stored_at < ttl
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if etag := self.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def to_response(self, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.body
+        return response
+
+
+class ResponseCache:
+    """Stores 200 responses by normalized URL with TTL, size cap and LRU eviction.
+
+    Each entry is a `<hash>.json` metadata file next to a `<hash>.body` file.
+    The body file's mtime doubles as the last-access time for eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: dict[str, tuple[int, float]] | None = None
+        self._total_bytes = 0
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(cache_key(url).encode("utf-8")).hexdigest()
+        base = self.directory / digest[:2] / digest
+        return base.with_suffix(".json"), base.with_suffix(".body")
+
+    def _load_index(self) -> dict[str, tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            for body_path in self.directory.glob("*/*.body"):
+                stat = body_path.stat()
+                self._index[str(body_path)] = (stat.st_size, stat.st_mtime)
+            self._total_bytes = sum(size for size, _ in self._index.values())
+        return self._index
+
+    def get(self, url: str) -> CachedResponse | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        self.touch(url)
+        return CachedResponse(
+            url=meta["url"],
+            stored_at=meta["stored_at"],
+            headers=meta["headers"],
+            encoding=meta.get("encoding"),
+            body=body,
+        )
+
+    def touch(self, url: str, revalidated: bool = False) -> None:
+        meta_path, body_path = self._paths(url)
+        now = time.time()
+        try:
+            os.utime(body_path, (now, now))
+            if revalidated:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                meta["stored_at"] = now
+                _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            index = self._load_index()
+            if str(body_path) in index:
+                index[str(body_path)] = (index[str(body_path)][0], now)
+
+    def put(self, url: str, response: requests.Response) -> None:
+        meta_path, body_path = self._paths(url)
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        meta: dict[str, Any] = {
+            "url": url,
+            "stored_at": time.time(),
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            index = self._load_index()
+            previous = index.get(str(body_path))
+            if previous:
+                self._total_bytes -= previous[0]
+            index[str(body_path)] = (len(body), time.time())
+            self._total_bytes += len(body)
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        if self._total_bytes <= self.max_bytes:
+            return
+        for body_path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            for path in (Path(body_path), Path(body_path).with_suffix(".json")):
+                path.unlink(missing_ok=True)
+            del index[body_path]
+            self._total_bytes -= size
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("http cache")
+    group.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    group.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL, help="seconds before revalidating")
+    group.add_argument("--cache-max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    group.add_argument("--no-cache", action="store_true", help="always hit the network")
+    group.add_argument("--offline", action="store_true", help="replay from the cache only")
+
+
+def cache_from_args(args: argparse.Namespace) -> ResponseCache | None:
+    if args.no_cache and not args.offline:
+        return None
+    return ResponseCache(args.cache_dir, ttl=args.cache_ttl, max_bytes=args.cache_max_bytes)
@@ -0,0 +1,264 @@
+"""Pooled HTTP client with retry/backoff shared by the research scripts."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fetch_engine import MAX_WORKERS
+from http_cache import OfflineCacheMiss, ResponseCache
+from instrumentation import METRICS
+
+TIMEOUT = 20
+USER_AGENT = "Mozilla/5.0 (compatible; eunu-log-corpus-bot/1.0)"
+
+POOL_SIZE = MAX_WORKERS
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+# Per host. High enough that a 16-thread pool on one host is not slowed down;
+# retries, Retry-After and adaptive concurrency handle hosts that push back.
+PER_HOST_REQUESTS_PER_SECOND = 100.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Spaces requests to each host evenly so no host sees more than the budget.
+
+    The budget is per host, so a slow or strict site never holds back
+    requests to the others. There is no overall cap: a run touching N hosts
+    may send up to N times the budget in total. A budget of 0 or less turns
+    it off.
+    """
+
+    def __init__(self, per_host_requests_per_second: float) -> None:
+        self._interval = 1.0 / per_host_requests_per_second if per_host_requests_per_second > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str = "") -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_CAP)
+    # Full jitter keeps parallel workers from retrying in lockstep.
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2**attempt)))
+
+
+class HttpClient:
+    """One keep-alive session per host, retries with backoff, a per-host rate limit.
+
+    With a cache, fresh entries are served without a request, stale ones are
+    revalidated with a conditional GET, and `offline` replays the cache only.
+    With a `base_url`, every request goes to that server instead, with the
+    original host as the first path segment (see `mock_server.py`).
+    """
+
+    def __init__(
+        self,
+        user_agent: str = USER_AGENT,
+        timeout: float = TIMEOUT,
+        pool_size: int = POOL_SIZE,
+        max_retries: int = MAX_RETRIES,
+        per_host_requests_per_second: float = PER_HOST_REQUESTS_PER_SECOND,
+        cache: ResponseCache | None = None,
+        offline: bool = False,
+        base_url: str | None = None,
+    ) -> None:
+        self.headers = {"User-Agent": user_agent}
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(per_host_requests_per_second)
+        self.cache = cache
+        self.offline = offline
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> HttpClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def session_for(self, url: str) -> requests.Session:
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(f"{parsed.scheme}://", adapter)
+                self._sessions[key] = session
+            return session
+
+    def route(self, url: str) -> str:
+        """Where a request for `url` is actually sent."""
+        if self.base_url is None:
+            return url
+        parsed = urlparse(url)
+        query = f"?{parsed.query}" if parsed.query else ""
+        return f"{self.base_url}/{parsed.netloc.lower()}{parsed.path or '/'}{query}"
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        max_retries: int | None = None,
+        before_send: Callable[[], None] | None = None,
+    ) -> requests.Response:
+        """GET through the cache; `max_retries=0` hands 429/5xx straight back to callers that pace themselves.
+
+        `before_send` is called after the rate limit and right before each
+        request goes out, so it never runs for a cache hit.
+        """
+        # Routed URLs key the cache too, so a mock run never mixes with the real cache.
+        url = self.route(url)
+        if self.cache is None:
+            if self.offline:
+                raise OfflineCacheMiss(url)
+            return self._get_with_retries(url, headers, max_retries, before_send)
+
+        cached = self.cache.get(url)
+        if cached is not None and (self.offline or cached.is_fresh(self.cache.ttl)):
+            METRICS.incr("cache.hits")
+            return cached.to_response(url)
+        if self.offline:
+            METRICS.incr("cache.offline_misses")
+            raise OfflineCacheMiss(url)
+        if cached is not None:
+            headers = {**(headers or {}), **cached.validators()}
+
+        response = self._get_with_retries(url, headers, max_retries, before_send)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            self.cache.touch(url, revalidated=True)
+            METRICS.incr("cache.revalidated")
+            return cached.to_response(url)
+        METRICS.incr("cache.misses")
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    def _get_with_retries(
+        self,
+        url: str,
+        headers: dict[str, str] | None,
+        max_retries: int | None = None,
+        before_send: Callable[[], None] | None = None,
+    ) -> requests.Response:
+        session = self.session_for(url)
+        host = self._origin_host(url)
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(host)
+            if before_send is not None:
+                before_send()
+            start = time.perf_counter()
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                METRICS.incr("http.errors")
+                if attempt >= max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                METRICS.incr("http.retries")
+                continue
+            self._record(host, response, time.perf_counter() - start)
+            if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(backoff_delay(attempt, retry_after))
+            attempt += 1
+            METRICS.incr("http.retries")
+
+    def _origin_host(self, url: str) -> str:
+        """The host `url` was meant for, so metrics stay per site behind a `base_url`."""
+        if self.base_url is not None and url.startswith(f"{self.base_url}/"):
+            return url[len(self.base_url) + 1 :].split("/", 1)[0]
+        return urlparse(url).netloc.lower()
+
+    @staticmethod
+    def _record(host: str, response: requests.Response, seconds: float) -> None:
+        # requests hides DNS/TLS, but `elapsed` stops at the response headers, so
+        # "ttfb" is connect + server time and "hosts" adds the body transfer.
+        METRICS.incr("http.requests")
+        METRICS.incr(f"http.status.{response.status_code}")
+        METRICS.incr("http.bytes", len(response.content))
+        METRICS.observe("hosts", host, seconds)
+        METRICS.observe("ttfb", host, response.elapsed.total_seconds())
+
+    def get_text(self, url: str) -> str:
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def get_json(self, url: str) -> Any:
+        response = self.get(url)
+        response.raise_for_status()
+        return response.json()
+
+
+def add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("http client")
+    group.add_argument(
+        "--base-url",
+        default=None,
+        help="send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py",
+    )
+    group.add_argument(
+        "--per-host-requests-per-second",
+        type=float,
+        metavar="RPS",
+        default=PER_HOST_REQUESTS_PER_SECOND,
+        help=(
+            "requests per second to each host; there is no overall cap, so N hosts may see N times this "
+            "in total; 0 turns the limit off (default: %(default)s)"
+        ),
+    )
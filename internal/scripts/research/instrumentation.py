@@ -0,0 +1,174 @@
+"""Run metrics for the research pipelines: counters, timers and latency histograms.
+
+Code on the hot paths records into the process-wide `METRICS`. Each script
+writes `METRICS.report()` as JSON next to its summary, so two runs can be
+diffed stage by stage. `--profile` and `--trace-memory` add cProfile stats
+and tracemalloc peaks to the same run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import cProfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+# Upper bounds in milliseconds; the last bucket takes everything slower.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+TRACEMALLOC_TOP = 15
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples, capped at the max."""
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS_MS[index], self.max_ms) if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": {
+                **{f"le_{bound}": count for bound, count in zip(BUCKETS_MS, self.buckets)},
+                "inf": self.buckets[-1],
+            },
+        }
+
+
+class Metrics:
+    """Thread-safe counters plus latency histograms grouped as `group -> key`.
+
+    Groups used by the scripts: `stages` (whole pipeline steps), `hosts`
+    (HTTP latency per host), `sources` (fetch per company/source) and
+    `parse` (parser time per source).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.perf_counter()
+            self.counters: Counter[str] = Counter()
+            self.histograms: dict[str, dict[str, Histogram]] = {}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, group: str, key: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.setdefault(group, {}).get(key)
+            if histogram is None:
+                histogram = self.histograms[group][key] = Histogram()
+            histogram.observe(seconds * 1000)
+
+    @contextmanager
+    def timer(self, group: str, key: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(group, key, time.perf_counter() - start)
+
+    def stage(self, name: str) -> Any:
+        return self.timer("stages", name)
+
+    def report(self, **extra: Any) -> dict[str, Any]:
+        with self._lock:
+            wall = time.perf_counter() - self.started
+            report: dict[str, Any] = {
+                "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+                "wall_seconds": round(wall, 3),
+                "counters": dict(sorted(self.counters.items())),
+            }
+            for group, histograms in sorted(self.histograms.items()):
+                report[group] = {key: histogram.to_dict() for key, histogram in sorted(histograms.items())}
+        report.update(extra)
+        return report
+
+
+METRICS = Metrics()
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--report", type=Path, default=None, help="where to write the JSON run report")
+    group.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="write cProfile stats to this file (main thread only; worker time is in the report timers)",
+    )
+    group.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="trace allocations with tracemalloc and add the peak and top sites to the report",
+    )
+
+
+@contextmanager
+def profiling(args: argparse.Namespace) -> Iterator[dict[str, Any]]:
+    """Run the block under the hooks requested on the command line.
+
+    Yields a dict that is filled with report fields once the block exits.
+    """
+    extra: dict[str, Any] = {}
+    profiler = cProfile.Profile() if args.profile else None
+    if args.trace_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield extra
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            extra["profile"] = str(args.profile)
+        if args.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            extra["memory"] = {
+                "peak_kib": round(peak / 1024, 1),
+                "top_sites": [
+                    {"site": str(stat.traceback), "kib": round(stat.size / 1024, 1), "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]
+                ],
+            }
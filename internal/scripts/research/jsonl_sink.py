@@ -0,0 +1,122 @@
+"""Streaming JSONL output that only ever exposes complete files."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+try:
+    import zstandard
+except ImportError:  # zstandard is only needed for .zst output
+    zstandard = None
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# mkstemp creates 0600 files; published outputs should get the usual umask mode.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def output_path(path: Path, compression: str) -> Path:
+    suffix = SUFFIXES[compression]
+    return path if not suffix or path.name.endswith(suffix) else path.with_name(path.name + suffix)
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JsonlSink:
+    """Writes rows to a temp file next to `path` and renames it into place on success.
+
+    Rows are serialised as they arrive, so memory does not grow with the
+    corpus. The temp file is fsynced before the atomic rename; on any error it
+    is removed and the previous output is left untouched.
+    """
+
+    def __init__(self, path: Path, compression: str = "none") -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd output needs the zstandard package")
+        self.path = output_path(Path(path), compression)
+        self.compression = compression
+        self.count = 0
+        self._raw: IO[bytes] | None = None
+        self._stream: Any = None
+        self._tmp_name = ""
+
+    def __enter__(self) -> JsonlSink:
+        fd, self._tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        os.fchmod(fd, FILE_MODE)
+        self._raw = os.fdopen(fd, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        return self
+
+    def write(self, row: dict[str, Any]) -> None:
+        self._stream.write((json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.count += 1
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        try:
+            if self._stream is not self._raw:
+                self._stream.close()
+            if exc_type is None:
+                self._raw.flush()
+                os.fsync(self._raw.fileno())
+            self._raw.close()
+            if exc_type is None:
+                os.replace(self._tmp_name, self.path)
+                _fsync_dir(self.path.parent)
+        finally:
+            Path(self._tmp_name).unlink(missing_ok=True)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.fchmod(fd, FILE_MODE)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, path)
+    finally:
+        Path(tmp_name).unlink(missing_ok=True)
+
+
+def iter_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    path = Path(path)
+    if path.name.endswith(".gz"):
+        stream: IO[bytes] = gzip.open(path, "rb")
+    elif path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("reading .zst needs the zstandard package")
+        stream = zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+    else:
+        stream = path.open("rb")
+    with stream, io.TextIOWrapper(stream, encoding="utf-8") as lines:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
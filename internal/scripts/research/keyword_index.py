@@ -0,0 +1,64 @@
+"""Compiled keyword index that scores every category in one pass over a text."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable, Mapping
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is an optional fast path
+    ahocorasick = None
+
+# Which matcher every index in this process uses; the pipelines print it and put it in their run report.
+MATCHER = "aho-corasick" if ahocorasick is not None else "linear"
+
+
+def matcher_notice() -> str | None:
+    """A line telling the user the fast path is off, or None when it is on."""
+    if ahocorasick is not None:
+        return None
+    return "pyahocorasick not installed: keyword matching scans each term (pip install pyahocorasick)"
+
+
+class KeywordIndex:
+    """Counts, per category, how many of its keywords occur as substrings.
+
+    Matches `sum(1 for kw in keywords if kw in text)` for every category. With
+    pyahocorasick installed, all terms are found in a single automaton pass
+    whose cost does not grow with the number of terms. Without it, each
+    distinct term is searched once, however many categories share it.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]]) -> None:
+        self.categories = {category: tuple(keywords) for category, keywords in categories.items()}
+        self._term_categories: dict[str, list[str]] = defaultdict(list)
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                self._term_categories[keyword].append(category)
+        self.terms = tuple(self._term_categories)
+
+        self._automaton = None
+        if ahocorasick is not None and self.terms:
+            automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                automaton.add_word(term, term)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def present(self, text: str) -> set[str]:
+        if self._automaton is None:
+            return {term for term in self.terms if term in text}
+        found: set[str] = set()
+        for _, term in self._automaton.iter(text):
+            found.add(term)
+            if len(found) == len(self.terms):
+                break
+        return found
+
+    def score(self, text: str) -> dict[str, int]:
+        scores = {category: 0 for category in self.categories}
+        for term in self.present(text):
+            for category in self._term_categories[term]:
+                scores[category] += 1
+        return scores
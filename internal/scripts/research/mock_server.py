@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""Local stand-in for the blogs the research scripts crawl.
+
+Serves the hand-written sample payloads in `fixtures/`, shaped like each
+site's responses, the way `--base-url` routes requests:
+https://d2.naver.com/d2.atom arrives as GET /d2.naver.com/d2.atom. Feeds,
+listings, the LINE sitemap and the WordPress API are scaled synthetically
+(`--scale` copies of every sample entry, each with its own link, title and
+date). Article pages are generated per slug from the sample toss.tech
+article. Any response can be delayed, failed with a 503
+or 429, or dropped, to see how the crawlers cope without touching the
+real sites.
+
+    python mock_server.py --scale 100 --latency 0.05 --error-rate 0.02
+    python mock_server.py --write-corpus /tmp/toss-corpus.md --articles 10000
+    python research.py --per-host-requests-per-second 0 nekaracuba --base-url http://127.0.0.1:8765 --no-cache
+    python research.py --per-host-requests-per-second 0 toss --base-url http://127.0.0.1:8765 --no-cache \\
+        --corpus /tmp/toss-corpus.md
+
+Everything is deterministic for a given `--scale` and `--seed` except which
+requests fail. GET /__stats returns the responses served so far.
+
+`--check` crawls the mock in-process at scale 1 and at `--scale` with the
+NEKARACUBA builder's own crawl and selection. It fails if the copies trip
+the near-duplicate filter, or if the larger scale fills less of any
+company's quota or selects fewer records overall:
+
+    python mock_server.py --check --scale 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+HOST = "127.0.0.1"
+PORT = 8765
+
+DEFAULT_SCALE = 1
+LINE_PAGES = 12
+WP_PAGES = 10
+DEFAULT_ARTICLES = 1000
+# Synthetic dates count back from here, newest first.
+EPOCH = datetime(2026, 2, 1, tzinfo=timezone.utc)
+RETRY_AFTER = 1
+
+# Words appended to copied titles. None of them contains a topic keyword, so
+# copies keep the topic of the entry they were copied from.
+VOCABULARY = (
+    "platform", "migration", "pipeline", "observability", "latency", "search", "mobile", "infra",
+    "storage", "cache", "queue", "cluster", "network", "kafka", "batch", "stream",
+    "backend", "server", "release", "rollout", "incident", "oncall", "scaling", "sharding",
+    "logging", "metrics", "tracing",
+    "성능", "운영", "테스트", "회고", "설계", "검색", "배포", "모니터링",
+    "장애", "확장", "데이터", "서버", "인프라", "개선", "자동화", "마이그레이션",
+)
+# LINE titles come from the URL slug until a page is enriched, so slugs take
+# the words that fit in a URL.
+SLUG_VOCABULARY = tuple(word for word in VOCABULARY if word.isascii())
+# A copy gets at least this many words, and one per two words of the title.
+# The near-duplicate filter compares word and word-pair shingles, so that
+# keeps every copy below its 0.8 similarity threshold against the others.
+MIN_TITLE_WORDS = 3
+
+Response = tuple[int, dict[str, str], bytes]
+
+
+def copy_words(text: str, copy: int, vocabulary: tuple[str, ...] = VOCABULARY) -> list[str]:
+    """The words that tell copy `copy` of `text` apart; none for the original."""
+    if copy == 0:
+        return []
+    count = min(len(vocabulary), max(MIN_TITLE_WORDS, -(-len(text.split()) // 2)))
+    return random.Random(copy).sample(vocabulary, count)
+
+
+def vary_title(title: str, copy: int) -> str:
+    if copy == 0:
+        return title
+    return f"{title} - {' '.join(copy_words(title, copy))}"
+
+
+def vary_link(link: str, copy: int) -> str:
+    if copy == 0:
+        return link
+    base, sep, query = link.partition("?")
+    trailing = "/" if base.endswith("/") else ""
+    return f"{base.rstrip('/')}-{copy}{trailing}{sep}{query}"
+
+
+def replicate_blocks(text: str, tag: str, scale: int, vary: Any) -> str:
+    """Repeat every `<tag>...</tag>` block `scale` times, passing each copy through `vary(block, copy)`."""
+    pattern = re.compile(rf"[ \t]*<{tag}\b.*?</{tag}>\n?", re.DOTALL)
+    return pattern.sub(lambda match: "".join(vary(match.group(0), copy) for copy in range(scale)), text)
+
+
+def json_response(data: Any, status: int = 200, headers: dict[str, str] | None = None) -> Response:
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return status, {"Content-Type": "application/json; charset=UTF-8", **(headers or {})}, body
+
+
+def text_response(text: str, content_type: str, status: int = 200) -> Response:
+    return status, {"Content-Type": f"{content_type}; charset=UTF-8"}, text.encode("utf-8")
+
+
+def not_found() -> Response:
+    return text_response("not found", "text/plain", 404)
+
+
+class MockSites:
+    """The sites' responses, built from the fixtures and scaled on demand."""
+
+    def __init__(
+        self,
+        fixture_dir: Path = FIXTURE_DIR,
+        scale: int = DEFAULT_SCALE,
+        line_pages: int = LINE_PAGES,
+        wp_pages: int = WP_PAGES,
+        seed: int = 0,
+    ) -> None:
+        def read(name: str) -> str:
+            return (fixture_dir / name).read_text(encoding="utf-8")
+
+        self.scale = max(scale, 1)
+        self.line_pages = line_pages
+        self.wp_pages = wp_pages
+        self.seed = seed
+        self._d2 = read("d2.atom.xml")
+        self._medium = read("coupang-medium.rss.xml")
+        self._kakao_contents = json.loads(read("kakao-contents.json"))
+        self._kakao_event = json.loads(read("kakao-event.json"))
+        self._line_listing = read("line-listing.html")
+        self._wp_posts = json.loads(read("woowahan-posts.json"))
+        self._article = read("toss-article.html")
+        self._line_posts = re.findall(r'<article class="post"><a href="/en/blog/([^"/]+)/">([^<]*)</a>', self._line_listing)
+        # Responses depend only on the path, so the large scaled ones are built once.
+        self.respond = lru_cache(maxsize=4096)(self._respond)
+
+    def _respond(self, host: str, path: str, query: str) -> Response:
+        if host == "d2.naver.com" and path == "/d2.atom":
+            return text_response(self.d2_feed(), "application/atom+xml")
+        if host == "medium.com" and path.startswith("/feed/"):
+            return text_response(self.medium_feed(), "application/rss+xml")
+        if host == "if.kakao.com" and path.startswith("/api/v1/"):
+            return json_response(self.kakao_contents() if path.endswith("/contents") else self._kakao_event)
+        if host == "engineering.linecorp.com":
+            return self.line(path)
+        if host == "techblog.woowahan.com" and path.startswith("/wp-json/"):
+            return self.wp_posts(parse_qs(query))
+        return text_response(self.article(f"{host}{path}"), "text/html")
+
+    def d2_feed(self) -> str:
+        def vary(block: str, copy: int) -> str:
+            block = re.sub(r'href="([^"]*)"', lambda m: f'href="{vary_link(m.group(1), copy)}"', block)
+            block = re.sub(r"<title>(.*?)</title>", lambda m: f"<title>{vary_title(m.group(1), copy)}</title>", block)
+            return re.sub(
+                r"<updated>(.*?)</updated>",
+                lambda m: f"<updated>{(datetime.fromisoformat(m.group(1)) - timedelta(days=copy)).isoformat()}</updated>",
+                block,
+            )
+
+        return replicate_blocks(self._d2, "entry", self.scale, vary)
+
+    def medium_feed(self) -> str:
+        def vary(block: str, copy: int) -> str:
+            block = re.sub(r"<link>(.*?)</link>", lambda m: f"<link>{vary_link(m.group(1), copy)}</link>", block)
+            block = re.sub(r"<title>(.*?)</title>", lambda m: f"<title>{vary_title(m.group(1), copy)}</title>", block)
+            return re.sub(
+                r"<pubDate>(.*?)</pubDate>",
+                lambda m: f"<pubDate>{format_datetime(parsedate_to_datetime(m.group(1)) - timedelta(days=copy))}</pubDate>",
+                block,
+            )
+
+        # Every tagged feed serves the same items, as the real ones mostly overlap.
+        return replicate_blocks(self._medium, "item", self.scale, vary)
+
+    def kakao_contents(self) -> dict[str, Any]:
+        content_map = {}
+        for slot, items in self._kakao_contents["data"]["contentMap"].items():
+            if not isinstance(items, list):
+                content_map[slot] = items
+                continue
+            content_map[slot] = [
+                {**item, "seq": item["seq"] + copy * 100_000, "title": vary_title(item["title"], copy)}
+                for copy in range(self.scale)
+                for item in items
+            ]
+        return {**self._kakao_contents, "data": {**self._kakao_contents["data"], "contentMap": content_map}}
+
+    def line_slug(self, page: int, index: int) -> tuple[str, str]:
+        """Slug and title of the `index`-th post on listing page `page`."""
+        base, title = self._line_posts[index % len(self._line_posts)]
+        copy = ((page - 1) * len(self._line_posts) * self.scale + index) // len(self._line_posts)
+        slug = "-".join([base, *copy_words(base.replace("-", " "), copy, SLUG_VOCABULARY), f"p{page}", str(index)])
+        return slug, vary_title(title, copy)
+
+    def line_date(self, page: int, index: int) -> datetime:
+        per_page = len(self._line_posts) * self.scale
+        return EPOCH - timedelta(hours=13 * ((page - 1) * per_page + index))
+
+    def line(self, path: str) -> Response:
+        if path == "/sitemap.xml":
+            return text_response(self.line_sitemap(), "application/xml")
+        listing = re.fullmatch(r"/(en|ko)/blog(?:/page/(\d+))?/?", path)
+        if listing:
+            page = int(listing.group(2) or 1)
+            if page > self.line_pages:
+                return not_found()
+            return text_response(self.line_listing(listing.group(1), page), "text/html")
+        post = re.fullmatch(r"/(en|ko)/blog/([^/]+)-p(\d+)-(\d+)/?", path)
+        if post:
+            return text_response(self.line_article(int(post.group(3)), int(post.group(4))), "text/html")
+        return not_found()
+
+    def line_listing(self, locale: str, page: int) -> str:
+        posts = "".join(
+            f'  <article class="post"><a href="/{locale}/blog/{slug}/">{title}</a></article>\n'
+            for slug, title in (self.line_slug(page, index) for index in range(len(self._line_posts) * self.scale))
+        )
+        html = re.sub(r'[ \t]*<article class="post">.*?</article>\n', "", self._line_listing)
+        html = html.replace("<main>\n", f"<main>\n{posts}", 1)
+        return html.replace("/en/", f"/{locale}/").replace("/page/2/", f"/page/{page + 1}/")
+
+    def line_sitemap(self) -> str:
+        urls = []
+        for page in range(1, self.line_pages + 1):
+            for index in range(len(self._line_posts) * self.scale):
+                slug, _ = self.line_slug(page, index)
+                lastmod = self.line_date(page, index).date().isoformat()
+                for locale in ("en", "ko"):
+                    loc = f"https://engineering.linecorp.com/{locale}/blog/{slug}/"
+                    urls.append(f"  <url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>\n")
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            f"{''.join(urls)}</urlset>\n"
+        )
+
+    def line_article(self, page: int, index: int) -> str:
+        _, title = self.line_slug(page, index)
+        published = self.line_date(page, index).isoformat()
+        head = (
+            f'<meta property="og:title" content="{title}">\n'
+            f'<meta property="article:published_time" content="{published}">\n'
+            '<meta property="article:tag" content="frontend">\n'
+        )
+        return self.article(f"engineering.linecorp.com/{page}/{index}", title).replace("</head>", f"{head}</head>", 1)
+
+    def wp_posts(self, query: dict[str, list[str]]) -> Response:
+        page = int((query.get("page") or ["1"])[0] or 1)
+        if not 1 <= page <= self.wp_pages:
+            error = {"code": "rest_post_invalid_page_number", "message": "out of range", "data": {"status": 400}}
+            return json_response(error, 400)
+        per_page = len(self._wp_posts) * self.scale
+        posts = []
+        for index in range(per_page):
+            item = self._wp_posts[index % len(self._wp_posts)]
+            copy = (page - 1) * self.scale + index // len(self._wp_posts)
+            posts.append(
+                {
+                    **item,
+                    "id": item["id"] + copy * 100_000,
+                    "date": (EPOCH - timedelta(hours=9 * ((page - 1) * per_page + index))).strftime("%Y-%m-%dT%H:%M:%S"),
+                    "link": vary_link(item["link"], copy),
+                    "title": {"rendered": vary_title(item["title"]["rendered"], copy)},
+                }
+            )
+        headers = {"X-WP-Total": str(per_page * self.wp_pages), "X-WP-TotalPages": str(self.wp_pages)}
+        return json_response(posts, headers=headers)
+
+    def article(self, key: str, title: str | None = None) -> str:
+        """The sample article with its paragraphs shuffled per `key`, so each page hashes differently."""
+        rng = random.Random(f"{self.seed}:{key}")
+        # Odd parts are the paragraphs.
+        parts = re.split(r"(<p>.*?</p>)", self._article, flags=re.DOTALL)
+        parts[1::2] = rng.sample(parts[1::2], len(parts[1::2]))
+        html = "".join(parts)
+        if title is not None:
+            html = re.sub(r"<title>.*?</title>", f"<title>{title}</title>", html, count=1, flags=re.DOTALL)
+        return html
+
+
+class Faults:
+    """Latency and failures injected into every response; thread-safe."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host_latency: dict[str, float] | None = None,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        retry_after: int = RETRY_AFTER,
+        capacity: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.host_latency = dict(host_latency or {})
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.drop_rate = drop_rate
+        self.retry_after = retry_after
+        self.capacity = capacity
+        self._in_flight: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def enter(self, host: str) -> bool:
+        """Count a request in; False if the host is already at `capacity` (0 means unlimited)."""
+        with self._lock:
+            self._in_flight[host] += 1
+            return not self.capacity or self._in_flight[host] <= self.capacity
+
+    def leave(self, host: str) -> None:
+        with self._lock:
+            self._in_flight[host] -= 1
+
+    def draw(self, host: str) -> tuple[float, str | None]:
+        """Delay before answering, and "drop", "throttle", "error" or None."""
+        with self._lock:
+            delay = self.host_latency.get(host, self.latency) + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+        for fault, rate in (("drop", self.drop_rate), ("throttle", self.throttle_rate), ("error", self.error_rate)):
+            if roll < rate:
+                return delay, fault
+            roll -= rate
+        return delay, None
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], sites: MockSites, faults: Faults) -> None:
+        super().__init__(address, MockHandler)
+        self.sites = sites
+        self.faults = faults
+        self.stats: Counter[str] = Counter()
+        self.stats_lock = threading.Lock()
+
+    def count(self, host: str, outcome: str) -> None:
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats[outcome] += 1
+            self.stats[f"host.{host}"] += 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real sites, so connection pooling is exercised.
+    protocol_version = "HTTP/1.1"
+    server: MockServer
+
+    def do_GET(self) -> None:
+        target = urlsplit(self.path)
+        if target.path == "/__stats":
+            with self.server.stats_lock:
+                self.send(*json_response(dict(self.server.stats)))
+            return
+        host, _, path = target.path.lstrip("/").partition("/")
+        within_capacity = self.server.faults.enter(host)
+        try:
+            self.serve(host, path, target.query, within_capacity)
+        finally:
+            self.server.faults.leave(host)
+
+    def serve(self, host: str, path: str, query: str, within_capacity: bool) -> None:
+        delay, fault = self.server.faults.draw(host)
+        if delay > 0:
+            time.sleep(delay)
+        if not within_capacity:
+            fault = "throttle"
+        if fault == "drop":
+            self.server.count(host, "dropped")
+            self.close_connection = True
+            return
+        if fault == "throttle":
+            self.server.count(host, "status.429")
+            status, headers, body = text_response("slow down", "text/plain", 429)
+            self.send(status, {**headers, "Retry-After": str(self.server.faults.retry_after)}, body)
+            return
+        if fault == "error":
+            self.server.count(host, "status.503")
+            self.send(*text_response("unavailable", "text/plain", 503))
+            return
+
+        status, headers, body = self.server.sites.respond(host.lower(), f"/{path}", query)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.server.count(host, "status.304")
+            self.send(304, {"ETag": etag}, b"")
+            return
+        self.server.count(host, f"status.{status}")
+        self.send(status, {**headers, "ETag": etag} if status == 200 else headers, body)
+
+    def send(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # One line per request would dominate a load test; /__stats has the totals.
+        pass
+
+
+def write_corpus(path: Path, articles: int) -> None:
+    """A Toss corpus markdown listing `articles` mock toss.tech URLs, for generate_toss_analysis.py --corpus."""
+    lines = ["# Mock toss.tech corpus", ""]
+    lines += [f"{i}. [Mock article {i}](https://toss.tech/article/mock-{i}) - frontend" for i in range(1, articles + 1)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def selection_counts(sites: MockSites) -> tuple[Counter[str], Counter[str], int]:
+    """Serve `sites` on a free port and run the builder's crawl and selection against it.
+
+    Returns the records collected and selected per company, and how many
+    titles the near-duplicate filter dropped.
+    """
+    import tempfile
+
+    import build_nekaracuba_corpus as builder
+    from crawl_state import CrawlState
+    from fetch_engine import FetchEngine
+    from http_client import HttpClient
+    from near_dupes import NearDuplicateIndex
+
+    server = MockServer((HOST, 0), sites, Faults())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{HOST}:{server.server_port}"
+    args = builder.parse_args(["--base-url", base_url, "--no-cache", "--no-full-text", "--no-snapshot"])
+    collected: Counter[str] = Counter()
+    near_index = NearDuplicateIndex(args.near_dup_threshold)
+    try:
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            HttpClient(base_url=base_url, per_host_requests_per_second=0) as client,
+            FetchEngine(host_limits=builder.SOURCES.host_limits()) as engine,
+            CrawlState(Path(tmp) / "state.db") as state,
+        ):
+            ctx = builder.crawl_context(args, engine, client, state)
+            selected = builder.crawl_and_select(ctx, args, collected, near_index)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return collected, Counter(record.company for record in selected), near_index.duplicates
+
+
+def check_scaling(args: argparse.Namespace) -> bool:
+    """Compare the builder's selection at scale 1 and at `args.scale`; print a table and return whether it passed."""
+    import build_nekaracuba_corpus as builder
+
+    results = {
+        scale: selection_counts(MockSites(args.fixtures, scale, args.line_pages, args.wp_pages, args.seed))
+        for scale in sorted({1, max(args.scale, 1)})
+    }
+    scales = list(results)
+    companies = sorted({company for collected, _, _ in results.values() for company in collected})
+    print(f"{'company':<10}" + "".join(f"  collected@{scale:<5} selected@{scale:<5}" for scale in scales))
+    for company in companies:
+        cells = "".join(
+            f"  {results[scale][0][company]:<15} {results[scale][1][company]:<14}" for scale in scales
+        )
+        print(f"{company:<10}{cells}")
+    for scale in scales:
+        print(f"near-duplicates dropped @{scale}: {results[scale][2]}")
+
+    # Beyond its quota a company competes with the others for the remaining
+    # places, so only the filled part of each quota has to grow with the scale.
+    quotas = builder.default_quotas()
+    base, top = results[scales[0]], results[scales[-1]]
+    failures = [
+        f"{company}: filled {min(base[1][company], quotas[company])} of its quota at scale 1 "
+        f"but {min(top[1][company], quotas[company])} at scale {scales[-1]}"
+        for company in companies
+        if min(top[1][company], quotas[company]) < min(base[1][company], quotas[company])
+    ]
+    if sum(top[1].values()) < sum(base[1].values()):
+        failures.append(f"selected {sum(base[1].values())} at scale 1 but {sum(top[1].values())} at scale {scales[-1]}")
+    # Copies of a title are distinct by construction; only near-duplicates already in the samples may repeat.
+    if top[2] > base[2] * scales[-1]:
+        failures.append(f"{top[2]} near-duplicates at scale {scales[-1]}, expected at most {base[2] * scales[-1]}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return not failures
+
+
+def parse_host_latency(value: str) -> tuple[str, float]:
+    host, _, seconds = value.partition("=")
+    try:
+        return host, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HOST=SECONDS, got {value!r}") from None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR, help="sample payloads to serve")
+    parser.add_argument("--scale", type=int, default=DEFAULT_SCALE, help="copies of every sample entry per response")
+    parser.add_argument("--line-pages", type=int, default=LINE_PAGES, help="LINE listing pages per locale")
+    parser.add_argument("--wp-pages", type=int, default=WP_PAGES, help="WordPress API pages")
+    parser.add_argument("--seed", type=int, default=0)
+
+    faults = parser.add_argument_group("faults")
+    faults.add_argument("--latency", type=float, default=0.0, help="seconds before every response")
+    faults.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, uniformly")
+    faults.add_argument(
+        "--host-latency",
+        type=parse_host_latency,
+        action="append",
+        default=[],
+        metavar="HOST=SECONDS",
+        help="latency for one host instead of --latency, e.g. medium.com=2; repeatable",
+    )
+    faults.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    faults.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    faults.add_argument("--retry-after", type=int, default=RETRY_AFTER, help="Retry-After seconds sent with a 429")
+    faults.add_argument("--drop-rate", type=float, default=0.0, help="fraction of connections closed without a response")
+    faults.add_argument(
+        "--capacity",
+        type=int,
+        default=0,
+        help="concurrent requests per host beyond which it answers 429 (0 means unlimited)",
+    )
+
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="run the NEKARACUBA crawl and selection at scale 1 and --scale, and exit non-zero if selection shrinks",
+    )
+    parser.add_argument("--write-corpus", type=Path, help="write a Toss corpus markdown of mock articles and exit")
+    parser.add_argument("--articles", type=int, default=DEFAULT_ARTICLES, help="articles for --write-corpus")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.write_corpus:
+        write_corpus(args.write_corpus, args.articles)
+        print(f"saved: {args.write_corpus} ({args.articles} articles)")
+        return
+    if args.check:
+        raise SystemExit(0 if check_scaling(args) else 1)
+
+    sites = MockSites(args.fixtures, args.scale, args.line_pages, args.wp_pages, args.seed)
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        host_latency=dict(args.host_latency),
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        drop_rate=args.drop_rate,
+        retry_after=args.retry_after,
+        capacity=args.capacity,
+        seed=args.seed,
+    )
+    server = MockServer((args.host, args.port), sites, faults)
+    print(f"serving on http://{args.host}:{server.server_port} (--base-url for the research scripts)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(dict(server.stats), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""MinHash + LSH clustering of near-duplicate texts (titles, excerpts).
+
+Each text becomes a set of lowercased `tokenize` unigrams and bigrams. The
+MinHash signature is split into bands; texts that share a band bucket are
+candidates, and only candidates are compared by exact Jaccard similarity.
+Every text is checked against the few cluster representatives in its buckets,
+so the work grows roughly linearly with the number of texts instead of with
+the number of pairs.
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Sequence
+
+from normalize import tokenize
+
+try:
+    import numpy as np
+except ImportError:  # numpy only vectorizes the signatures; results are the same without it
+    np = None
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.8
+# Texts this short collide too easily ("Design System"), so they are never merged.
+MIN_FEATURES = 4
+
+# 31-bit hashes keep (a * x + b) below 2**63, so numpy can do the arithmetic in int64.
+_PRIME = (1 << 31) - 1
+
+
+def features(text: str) -> frozenset[str]:
+    tokens = [token.lower() for token in tokenize(text)]
+    return frozenset([*tokens, *(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))])
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(blake2b(feature.encode("utf-8"), digest_size=4).digest(), "big") % _PRIME
+
+
+class MinHasher:
+    """Signatures from `num_perm` universal hashes `(a * x + b) mod p` over the feature hashes."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self._params], dtype=np.int64)[:, None]
+            self._b = np.array([b for _, b in self._params], dtype=np.int64)[:, None]
+
+    def signature(self, feature_set: frozenset[str]) -> tuple[int, ...]:
+        hashes = [_feature_hash(feature) for feature in feature_set]
+        if not hashes:
+            return (_PRIME,) * self.num_perm
+        if np is not None:
+            values = (self._a * np.array(hashes, dtype=np.int64) + self._b) % _PRIME
+            return tuple(values.min(axis=1).tolist())
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._params)
+
+
+class NearDuplicateIndex:
+    """Incremental clustering: each `add` returns the id of the text's cluster.
+
+    Ids are assigned in insertion order, and a cluster's id is the id of its
+    first text, so adding texts one at a time gives the same answer as
+    clustering them all at once.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        # Only cluster representatives are kept; members never need comparing again.
+        self._representatives: dict[int, frozenset[str]] = {}
+        # (band, band values) -> ids of the cluster representatives seen in that bucket.
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+        self._next_id = 0
+        self.duplicates = 0
+
+    def add(self, text: str) -> int:
+        index = self._next_id
+        self._next_id += 1
+        feature_set = features(text)
+        if len(feature_set) < MIN_FEATURES:
+            return index
+        signature = self._hasher.signature(feature_set)
+        rows = self._rows
+        keys = [(band, signature[band * rows : (band + 1) * rows]) for band in range(self.bands)]
+        for key in keys:
+            for representative in self._buckets.get(key, ()):
+                if jaccard(feature_set, self._representatives[representative]) >= self.threshold:
+                    self.duplicates += 1
+                    return representative
+        self._representatives[index] = feature_set
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return index
+
+    def is_new(self, text: str) -> bool:
+        """Add `text` and report whether it started a cluster rather than joining one."""
+        index = self._next_id
+        return self.add(text) == index
+
+
+def near_duplicate_clusters(
+    texts: Sequence[str],
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+) -> list[int]:
+    """Return, for each text, the index of the first text in its cluster (itself if unique)."""
+    index = NearDuplicateIndex(threshold, num_perm, bands)
+    return [index.add(text) for text in texts]
+
+
+def keep_mask(texts: Sequence[str], threshold: float = THRESHOLD) -> list[bool]:
+    """True for the first text of each near-duplicate cluster, in input order."""
+    return [canonical == index for index, canonical in enumerate(near_duplicate_clusters(texts, threshold))]
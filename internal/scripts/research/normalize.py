@@ -0,0 +1,89 @@
+"""URL, date and text normalization shared by the research scripts.
+
+`normalize_url` and `to_iso_datetime` run on every record, and feeds repeat
+the same links and timestamps across pages, so both are memoized with a
+bounded LRU cache.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse
+
+MEMO_SIZE = 1 << 16
+EPOCH = "1970-01-01T00:00:00+00:00"
+
+_SLASHES = re.compile(r"/+")
+_TOKENS = re.compile(r"[A-Za-z][A-Za-z0-9_-]{2,}|[가-힣]{2,}")
+# The RSS pubDate shape feeds actually send; anything else goes through email.utils.
+_RFC2822 = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+([1-9]\d{3})\s+(\d{2}):(\d{2})(?::(\d{2}))?"
+    r"(?:\s+(?:([+-])(\d{2})(\d{2})|GMT|UTC|UT))?"
+)
+_MONTHS = {
+    name: index
+    for index, name in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)
+}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def normalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    netloc = parsed.netloc.lower()
+    path = parsed.path
+    if "//" in path:
+        path = _SLASHES.sub("/", path)
+    path = path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme, netloc, path, "", "", ""))
+
+
+def _utc_iso(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def _parse_rfc2822(value: str) -> datetime:
+    match = _RFC2822.fullmatch(value)
+    month = _MONTHS.get(match.group(2).lower()) if match else None
+    if month is None:
+        return parsedate_to_datetime(value)
+    day, _, year, hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+    tz = timezone.utc
+    if sign:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        tz = timezone(-offset if sign == "-" else offset)
+    return datetime(int(year), month, int(day), int(hour), int(minute), int(second or 0), tzinfo=tz)
+
+
+def _looks_rfc2822(value: str) -> bool:
+    # "Tue, 13 Jan 2026 ..." or "13 Jan 2026 ...". ISO 8601 starts with a four-digit
+    # year, so fromisoformat could never accept either shape.
+    return value[0].isalpha() or " " in value[:3]
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def to_iso_datetime(value: str | None) -> str:
+    if not value:
+        return EPOCH
+    value = value.strip()
+    if not value:
+        return EPOCH
+    # Feeds mix ISO 8601 and RFC 2822; pick the parser up front instead of failing into the other.
+    if not _looks_rfc2822(value):
+        try:
+            return _utc_iso(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+    try:
+        return _utc_iso(_parse_rfc2822(value))
+    except (TypeError, ValueError):
+        return EPOCH
+
+
+def tokenize(text: str) -> list[str]:
+    # Keep English words and Korean blocks.
+    return _TOKENS.findall(text)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Filter and aggregate a columnar corpus export without materialising its rows.
+
+Examples:
+  query_corpus.py corpus.parquet --month --group-by company --group-by month
+  query_corpus.py analysis.arrow --min category_scores.design_system=3 --select url --select title
+  query_corpus.py corpus.parquet --sort date --desc --limit 20 --select title
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from columnar import pa, pc, read_table
+
+
+def split_assignment(value: str) -> tuple[str, str]:
+    column, sep, operand = value.partition("=")
+    if not sep or not column:
+        raise argparse.ArgumentTypeError(f"expected COLUMN=VALUE, got {value!r}")
+    return column, operand
+
+
+def column_scalar(table: pa.Table, column: str, operand: str) -> pa.Scalar:
+    field_type = table.schema.field(column).type
+    if pa.types.is_dictionary(field_type):
+        field_type = field_type.value_type
+    return pa.scalar(operand).cast(field_type)
+
+
+def filter_table(
+    table: pa.Table,
+    where: list[tuple[str, str]],
+    minimums: list[tuple[str, str]],
+) -> pa.Table:
+    conditions = [pc.equal(table[column], column_scalar(table, column, operand)) for column, operand in where]
+    conditions += [
+        pc.greater_equal(table[column], column_scalar(table, column, operand)) for column, operand in minimums
+    ]
+    if not conditions:
+        return table
+    mask = conditions[0]
+    for condition in conditions[1:]:
+        mask = pc.and_(mask, condition)
+    return table.filter(mask)
+
+
+def decode_dictionaries(table: pa.Table, columns: list[str] | None = None) -> pa.Table:
+    """Cast dictionary-encoded `columns` (all of them by default) back to their value type."""
+    for index, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type) and (columns is None or field.name in columns):
+            table = table.set_column(index, field.name, table.column(index).cast(field.type.value_type))
+    return table
+
+
+def query(args: argparse.Namespace) -> pa.Table:
+    """Filter, then group, then sort and limit, and only then project, so any column can be sorted on."""
+    table = filter_table(read_table(args.path), args.where, args.min)
+    if args.month:
+        table = table.append_column("month", pc.utf8_slice_codeunits(table["date"], 0, 7))
+
+    if args.group_by:
+        aggregations = [([], "count_all")] + [(column, "mean") for column in args.mean]
+        table = table.group_by(args.group_by).aggregate(aggregations)
+        table = table.rename_columns([name.replace("count_all", "count") for name in table.column_names])
+
+    # Arrow cannot sort dictionary columns, so only the sort keys are decoded before sorting.
+    if args.sort:
+        table = decode_dictionaries(table, [args.sort])
+        table = table.sort_by([(args.sort, "descending" if args.desc else "ascending")])
+    elif args.group_by:
+        table = decode_dictionaries(table, args.group_by)
+        table = table.sort_by([(column, "ascending") for column in args.group_by])
+    if args.limit:
+        table = table.slice(0, args.limit)
+    if args.select and not args.group_by:
+        table = table.select(args.select)
+    # What is left is small, so the rest are decoded for printing.
+    return decode_dictionaries(table)
+
+
+def format_table(table: pa.Table) -> str:
+    rows = [[str(value) for value in row.values()] for row in table.to_pylist()]
+    header = table.column_names
+    widths = [max([len(name), *(len(row[i]) for row in rows)]) for i, name in enumerate(header)]
+    lines = ["  ".join(name.ljust(width) for name, width in zip(header, widths))]
+    lines += ["  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="a .parquet or .arrow export")
+    parser.add_argument("--where", type=split_assignment, action="append", default=[], metavar="COL=VALUE")
+    parser.add_argument("--min", type=split_assignment, action="append", default=[], metavar="COL=VALUE")
+    parser.add_argument("--month", action="store_true", help="add a YYYY-MM `month` column derived from `date`")
+    parser.add_argument("--group-by", action="append", default=[], metavar="COL", help="count rows per group")
+    parser.add_argument("--mean", action="append", default=[], metavar="COL", help="also average COL per group")
+    parser.add_argument("--select", action="append", default=[], metavar="COL", help="columns to print")
+    parser.add_argument("--sort", metavar="COL", help="sort by COL, which need not be selected")
+    parser.add_argument("--desc", action="store_true", help="sort in descending order")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    result = query(args)
+    if args.json:
+        for row in result.to_pylist():
+            print(json.dumps(row, ensure_ascii=False, default=str))
+        return
+    print(format_table(result))
+    print(f"({result.num_rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Run the research pipelines from one entry point.
+
+    research.py nekaracuba [pipeline options]
+    research.py toss [pipeline options]
+    research.py all [options of either pipeline]
+
+Pipeline options are the ones each script takes on its own. `all` runs
+both pipelines at once in one process, sharing one HTTP client: its
+per-host connection pools, response cache and rate limiter. Each pipeline
+takes the options it knows, and an option neither knows is an error. It
+writes a single combined run report. Pipeline modules, and the `requests`/`bs4`
+stack they import, are only loaded once the command is known.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+OUT_REPORT = ROOT / "docs/research/research-run-report.json"
+
+PIPELINES = {
+    "nekaracuba": "build_nekaracuba_corpus",
+    "toss": "generate_toss_analysis",
+}
+COMMANDS = (*PIPELINES, "all")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        usage=f"%(prog)s [shared options] {{{','.join(COMMANDS)}}} [pipeline options]",
+    )
+    parser.add_argument(
+        "--per-host-requests-per-second",
+        type=float,
+        metavar="RPS",
+        default=None,
+        help=(
+            "requests per second to each host, shared by every pipeline; not an overall cap "
+            "(default: the pipelines' --per-host-requests-per-second)"
+        ),
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="keep-alive connections per host (default: the most download threads any pipeline uses)",
+    )
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument(
+        "pipeline_args",
+        nargs=argparse.REMAINDER,
+        help="passed to the pipeline; see `%(prog)s <command> --help`",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_pipeline_args(modules: dict[str, ModuleType], argv: list[str]) -> dict[str, argparse.Namespace]:
+    """Each pipeline's options; with several pipelines, each takes the flags it knows."""
+    if len(modules) == 1:
+        return {name: module.parse_args(argv) for name, module in modules.items()}
+    parsed: dict[str, argparse.Namespace] = {}
+    unknown: list[str] | None = None
+    for name, module in modules.items():
+        parsed[name], rest = module.build_parser().parse_known_args(argv)
+        unknown = rest if unknown is None else [arg for arg in unknown if arg in rest]
+    if unknown:
+        argparse.ArgumentParser(prog="research.py all").error(f"unrecognized arguments: {' '.join(unknown)}")
+    return parsed
+
+
+def shared_client(
+    args: argparse.Namespace, parsed: dict[str, argparse.Namespace], modules: dict[str, ModuleType]
+) -> Any:
+    """One client for every pipeline in the run, with the pipeline's own identity when there is only one."""
+    from http_cache import cache_from_args
+    from http_client import HttpClient
+
+    # Options every pipeline shares parse the same in each of them.
+    pipeline_args = next(iter(parsed.values()))
+    options: dict[str, Any] = {
+        "cache": cache_from_args(pipeline_args),
+        "offline": pipeline_args.offline,
+        "base_url": pipeline_args.base_url,
+        "per_host_requests_per_second": pipeline_args.per_host_requests_per_second,
+        # Enough connections for the busiest pipeline, so none are opened and discarded.
+        "pool_size": max(modules[name].connection_pool_size(parsed[name]) for name in parsed),
+    }
+    if len(modules) == 1:
+        module = next(iter(modules.values()))
+        options.update(user_agent=module.USER_AGENT, timeout=module.TIMEOUT)
+    if args.per_host_requests_per_second is not None:
+        options["per_host_requests_per_second"] = args.per_host_requests_per_second
+    if args.pool_size is not None:
+        options["pool_size"] = args.pool_size
+    return HttpClient(**options)
+
+
+def run(args: argparse.Namespace) -> Path:
+    from instrumentation import METRICS, profiling
+    from jsonl_sink import write_text_atomic
+
+    names = list(PIPELINES) if args.command == "all" else [args.command]
+    modules = {name: importlib.import_module(PIPELINES[name]) for name in names}
+    parsed = parse_pipeline_args(modules, args.pipeline_args)
+    # Run-wide options (profiling, report) parse the same in every pipeline.
+    run_args = parsed[names[0]]
+    single = modules[names[0]] if len(names) == 1 else None
+
+    METRICS.reset()
+    with profiling(run_args) as profile, shared_client(args, parsed, modules) as client:
+        if single is not None:
+            stats: dict[str, Any] = single.build(run_args, client)
+        else:
+            with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="pipeline") as pool:
+                futures = {name: pool.submit(modules[name].build, parsed[name], client) for name in names}
+                stats = {"pipelines": {name: future.result() for name, future in futures.items()}}
+
+    report_path = run_args.report or (single.OUT_REPORT if single is not None else OUT_REPORT)
+    report = METRICS.report(**stats, **profile)
+    write_text_atomic(report_path, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    return report_path
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report_path = run(args)
+    print("saved:", report_path)
+
+
+if __name__ == "__main__":
+    main()
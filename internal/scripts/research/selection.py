@@ -0,0 +1,159 @@
+"""Single-pass quota selection over streaming candidates with bounded heaps.
+
+`QuotaSelector` picks `target` items: first up to `quotas[group]` of the
+highest-keyed items of each group (in quota order), then the highest-keyed
+of everything else. Candidates are offered one at a time in any order and
+only those that could still be selected are kept. Selection costs
+O(n log k) time and O(k) memory for `n` candidates and
+`k = target + sum(quotas)`.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+# (key, tie-break, item). The tie-break is negated so that, among equal
+# keys, the item offered with the lower `order` counts as the larger one.
+_Entry = tuple[Any, Any, Any]
+
+
+def _negate(order: tuple[int, ...]) -> tuple[int, ...]:
+    return tuple(-part for part in order)
+
+
+class _TopK:
+    """Min-heap holding the `size` largest entries seen so far."""
+
+    __slots__ = ("size", "heap")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.heap: list[_Entry] = []
+
+    def floor(self) -> _Entry | None:
+        """The smallest kept entry once the heap is full; anything not above it is rejected."""
+        return self.heap[0] if self.heap and len(self.heap) >= self.size else None
+
+    def accepts(self, key_floor: Any) -> bool:
+        if self.size <= 0:
+            return False
+        floor = self.floor()
+        return floor is None or key_floor >= floor[0][: len(key_floor)]
+
+    def offer(self, entry: _Entry) -> _Entry | None:
+        """Keep `entry` if it ranks; returns whichever entry was turned away, if any."""
+        if self.size <= 0:
+            return entry
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, entry)
+            return None
+        if entry[:2] > self.heap[0][:2]:
+            return heapq.heapreplace(self.heap, entry)
+        return entry
+
+    def shrink(self, size: int) -> None:
+        self.size = max(size, 0)
+        while len(self.heap) > self.size:
+            heapq.heappop(self.heap)
+
+
+class QuotaSelector(Generic[T]):
+    """Top-`target` selection with per-group minimums, fed one candidate at a time.
+
+    `result()` returns what a two-phase selection over fully sorted lists
+    would produce. Phase one takes each group's quota in quota order. Phase
+    two fills up to `target` with the highest-keyed items that are left.
+    Items sharing an `identity` (a link, say) are selected at most once;
+    identities are assumed unique across groups.
+
+    Each group keeps its top `quota` items. Items a group turns away go to
+    one overflow heap. Phase two can never need more than
+    `target - (items held for quotas)` of them, so the overflow heap shrinks
+    as the group heaps fill.
+    """
+
+    def __init__(
+        self,
+        target: int,
+        quotas: Mapping[str, int],
+        group: Callable[[T], str],
+        key: Callable[[T], Any],
+        identity: Callable[[T], Hashable],
+    ) -> None:
+        self.target = target
+        self.quotas = dict(quotas)
+        self.group = group
+        self.key = key
+        self.identity = identity
+        self._groups = {name: _TopK(quota) for name, quota in self.quotas.items()}
+        self._held = 0
+        self._overflow = _TopK(target)
+        self.offered = 0
+
+    def offer(self, item: T, order: tuple[int, ...]) -> None:
+        """Consider `item`; `order` breaks key ties, lower first (e.g. source rank, position)."""
+        self.offered += 1
+        key = self.key(item)
+        group = self._groups.get(self.group(item))
+        # Most candidates in a long stream rank below both floors; reject those before building an entry.
+        if self._below(self._overflow, key) and (group is None or self._below(group, key)):
+            return
+        entry: _Entry | None = (key, _negate(order), item)
+        if group is not None:
+            before = len(group.heap)
+            entry = group.offer(entry)
+            if len(group.heap) > before:
+                self._held += 1
+                self._overflow.shrink(self.target - self._held)
+        if entry is not None:
+            self._overflow.offer(entry)
+
+    @staticmethod
+    def _below(heap: _TopK, key: Any) -> bool:
+        if heap.size <= 0:
+            return True
+        return len(heap.heap) >= heap.size and key < heap.heap[0][0]
+
+    def could_take(self, key_floor: Any, group: str | None = None) -> bool:
+        """Whether an item whose key is at least `key_floor` could still be selected.
+
+        Callers feeding a stream sorted by key, highest first, can stop
+        pulling from it once this turns false. `key_floor` is a key prefix
+        (e.g. `(date,)` for `(date, title)` keys). With `group=None`, every
+        group's heap is consulted.
+        """
+        if self._overflow.accepts(key_floor):
+            return True
+        groups = self._groups.values() if group is None else [self._groups.get(group)]
+        return any(heap is not None and heap.accepts(key_floor) for heap in groups)
+
+    def result(self) -> list[T]:
+        """The selection, highest key first; ties keep selection order."""
+        selected: list[T] = []
+        seen: set[Hashable] = set()
+
+        def take(entries: Iterable[_Entry], limit: int) -> None:
+            taken = 0
+            for _, _, item in entries:
+                if taken >= limit or len(selected) >= self.target:
+                    return
+                identity = self.identity(item)
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                selected.append(item)
+                taken += 1
+
+        def descending(entries: Iterable[_Entry]) -> list[_Entry]:
+            return sorted(entries, key=lambda entry: entry[:2], reverse=True)
+
+        for name, heap in self._groups.items():
+            take(descending(heap.heap), self.quotas[name])
+        if len(selected) < self.target:
+            leftovers = [entry for heap in self._groups.values() for entry in heap.heap]
+            take(descending([*leftovers, *self._overflow.heap]), self.target)
+        selected.sort(key=self.key, reverse=True)
+        return selected
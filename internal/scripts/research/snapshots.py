@@ -0,0 +1,229 @@
+"""Content-addressed snapshots of each build and the change feed between builds.
+
+Every output row gets a hash of its canonical JSON. A snapshot is the
+ordered list of `(key, hash, row)` for one build. It is stored once as
+`<name>/<snapshot id>.jsonl.gz`, where the id hashes the keys and row
+hashes, so an unchanged rebuild adds no file. Each build appends a line
+to `<name>/history.jsonl` with its row counts per group and how many rows
+were added, removed or modified. Summaries can show coverage over time
+from that file alone.
+
+The change feed lists, by key (the row's normalized link), what the
+latest build added, removed or modified relative to the previous one.
+Downstream steps only need to process those rows.
+
+Some columns are derived from the whole corpus rather than from the row's
+own source, such as TF-IDF keywords, and shift whenever any row is added
+or removed. Columns named as `derived` are left out of the row hash and
+hashed on their own. A row whose source fields are unchanged but whose
+derived columns moved is listed after the source changes as `recomputed`,
+not as `modified`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from jsonl_sink import JsonlSink, iter_jsonl, write_text_atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+SNAPSHOT_DIR = ROOT / ".cache/research/snapshots"
+HISTORY_FILE = "history.jsonl"
+
+Row = dict[str, Any]
+# key, hash of the source fields, hash of the derived columns ("" without any), row
+Entry = tuple[str, str, str, Row]
+
+
+def row_hash(row: Row, exclude: Iterable[str] = ()) -> str:
+    excluded = set(exclude)
+    if excluded:
+        row = {column: value for column, value in row.items() if column not in excluded}
+    canonical = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class SnapshotDiff:
+    snapshot: str
+    previous: str | None
+    rows: int
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    recomputed: int = 0
+    groups: dict[str, int] = field(default_factory=dict)
+    created_at_utc: str = ""
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "snapshot": self.snapshot,
+            "previous_snapshot": self.previous,
+            "rows_added": self.added,
+            "rows_removed": self.removed,
+            "rows_modified": self.modified,
+            "rows_recomputed": self.recomputed,
+        }
+
+
+class SnapshotStore:
+    """The snapshots and build history of one dataset, under `directory/name`."""
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self.path = Path(directory) / name
+        self.name = name
+
+    def history(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Build history, oldest first; the last `limit` builds if given."""
+        path = self.path / HISTORY_FILE
+        entries = list(iter_jsonl(path)) if path.exists() else []
+        return entries[-limit:] if limit else entries
+
+    def snapshot_path(self, snapshot: str) -> Path:
+        return self.path / f"{snapshot}.jsonl.gz"
+
+    def latest(self) -> str | None:
+        entries = self.history(1)
+        return entries[0]["snapshot"] if entries else None
+
+    def hashes(self, snapshot: str | None) -> dict[str, tuple[str, str]]:
+        """Key -> (row hash, derived hash) of a stored snapshot, in snapshot order; empty if there is none."""
+        if snapshot is None or not self.snapshot_path(snapshot).exists():
+            return {}
+        return {
+            entry["key"]: (entry["hash"], entry.get("derived_hash", ""))
+            for entry in iter_jsonl(self.snapshot_path(snapshot))
+        }
+
+    def commit(self, entries: list[Entry], groups: Counter[str], changes_path: Path) -> SnapshotDiff:
+        """Store a build's `(key, hash, derived hash, row)` entries and write its change feed to `changes_path`."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        digest = blake2b(digest_size=16)
+        for key, hashed, derived_hash, _ in entries:
+            digest.update(f"{key}\t{hashed}\t{derived_hash}\n".encode("utf-8"))
+        snapshot = digest.hexdigest()
+
+        previous = self.latest()
+        if previous is not None and not self.snapshot_path(previous).exists():
+            # The previous snapshot file was deleted; diff against nothing.
+            previous = None
+        before = self.hashes(previous)
+        diff = SnapshotDiff(
+            snapshot=snapshot,
+            previous=previous,
+            rows=len(entries),
+            groups=dict(groups),
+            created_at_utc=datetime.now(timezone.utc).isoformat(),
+        )
+
+        current_keys = set()
+        recomputed: list[Entry] = []
+        with JsonlSink(changes_path) as feed:
+            for entry in entries:
+                key, hashed, derived_hash, row = entry
+                current_keys.add(key)
+                previous = before.get(key)
+                if previous is None:
+                    feed.write({"op": "added", "key": key, "hash": hashed, "row": row})
+                    diff.added += 1
+                elif previous[0] != hashed:
+                    feed.write({"op": "modified", "key": key, "hash": hashed, "previous_hash": previous[0], "row": row})
+                    diff.modified += 1
+                elif previous[1] != derived_hash:
+                    recomputed.append(entry)
+            for key, (previous_hash, _) in before.items():
+                if key not in current_keys:
+                    feed.write({"op": "removed", "key": key, "previous_hash": previous_hash})
+                    diff.removed += 1
+            # Source changes come first; rows that only moved with the rest of the corpus follow.
+            for key, hashed, derived_hash, row in recomputed:
+                feed.write({"op": "recomputed", "key": key, "hash": hashed, "derived_hash": derived_hash, "row": row})
+                diff.recomputed += 1
+
+        if not self.snapshot_path(snapshot).exists():
+            with JsonlSink(self.snapshot_path(snapshot), "gzip") as sink:
+                for key, hashed, derived_hash, row in entries:
+                    sink.write({"key": key, "hash": hashed, "derived_hash": derived_hash, "row": row})
+        lines = [json.dumps(entry, ensure_ascii=False) for entry in self.history()]
+        lines.append(json.dumps(asdict(diff), ensure_ascii=False))
+        write_text_atomic(self.path / HISTORY_FILE, "\n".join(lines) + "\n")
+        return diff
+
+
+class SnapshotSink:
+    """Collects output rows and commits them as a snapshot when the block exits cleanly.
+
+    `key` maps a row to its identity (its normalized link) and `group` to
+    the bucket its coverage is counted under. `derived` names the columns
+    computed from the whole corpus, which are hashed apart from the rest.
+    A later row with the same key replaces an earlier one. With `store=None` the sink accepts rows and
+    records nothing, so callers can always write to it. `diff` holds the
+    result after a successful commit.
+    """
+
+    def __init__(
+        self,
+        store: SnapshotStore | None,
+        changes_path: Path,
+        key: Callable[[Row], str],
+        group: Callable[[Row], str] | None = None,
+        derived: Iterable[str] = (),
+    ) -> None:
+        self.store = store
+        self.changes_path = Path(changes_path)
+        self.key = key
+        self.group = group
+        self.derived = tuple(derived)
+        self.diff: SnapshotDiff | None = None
+        self._entries: dict[str, Entry] = {}
+
+    def __enter__(self) -> SnapshotSink:
+        return self
+
+    def write(self, row: Row) -> None:
+        if self.store is None:
+            return
+        key = self.key(row)
+        derived_hash = row_hash({column: row.get(column) for column in self.derived}) if self.derived else ""
+        self._entries[key] = (key, row_hash(row, self.derived), derived_hash, row)
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is not None or self.store is None:
+            return
+        entries = list(self._entries.values())
+        groups = Counter(self.group(row) for *_, row in entries) if self.group else Counter()
+        self.diff = self.store.commit(entries, groups, self.changes_path)
+
+
+def changes_path(jsonl_path: Path) -> Path:
+    """`corpus.jsonl[.gz|.zst]` -> `corpus-changes.jsonl`."""
+    name = Path(jsonl_path).name
+    return Path(jsonl_path).with_name(f"{name[: name.index('.jsonl')]}-changes.jsonl")
+
+
+def add_snapshot_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("snapshots")
+    group.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        default=SNAPSHOT_DIR,
+        help="where each build's snapshot and the build history are kept",
+    )
+    group.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="do not snapshot this build or write its change feed",
+    )
+
+
+def snapshot_store_from_args(args: argparse.Namespace, name: str) -> SnapshotStore | None:
+    if args.no_snapshot:
+        return None
+    return SnapshotStore(args.snapshot_dir, name)
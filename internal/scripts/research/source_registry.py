@@ -0,0 +1,64 @@
+"""Registry of corpus sources, each a lazy generator of records.
+
+A source is registered with a decorator and contributes its company name,
+its position in the selection order and any per-host concurrency limits.
+Adding a source means writing one generator; the builder discovers it here.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Mapping
+
+Fetcher = Callable[[Any], Iterator[Any]]
+
+
+@dataclass(frozen=True)
+class Source:
+    company: str
+    fetch: Fetcher
+    # True when the generator yields newest first, so selection can stop
+    # pulling as soon as its quota is met. Unordered sources are read fully
+    # and sorted before selection.
+    ordered: bool = False
+    host_limits: Mapping[str, int] = field(default_factory=dict)
+
+
+class SourceRegistry:
+    def __init__(self) -> None:
+        self._sources: dict[str, Source] = {}
+
+    def register(
+        self,
+        company: str,
+        *,
+        ordered: bool = False,
+        host_limits: Mapping[str, int] | None = None,
+    ) -> Callable[[Fetcher], Fetcher]:
+        def decorator(fetch: Fetcher) -> Fetcher:
+            if company in self._sources:
+                raise ValueError(f"source already registered: {company}")
+            self._sources[company] = Source(company, fetch, ordered, dict(host_limits or {}))
+            return fetch
+
+        return decorator
+
+    def __iter__(self) -> Iterator[Source]:
+        return iter(self._sources.values())
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __getitem__(self, company: str) -> Source:
+        return self._sources[company]
+
+    def companies(self) -> list[str]:
+        """Registration order, which is also the order selection fills quotas in."""
+        return list(self._sources)
+
+    def host_limits(self) -> dict[str, int]:
+        limits: dict[str, int] = {}
+        for source in self:
+            for host, limit in source.host_limits.items():
+                limits[host] = min(limit, limits.get(host, limit))
+        return limits
@@ -0,0 +1,100 @@
+"""Corpus-level TF-IDF over per-article term counts, computed with NumPy/SciPy.
+
+All articles go into one sparse document-term matrix, weighted as
+`(1 + log tf) * idf`, where `idf = log((1 + n) / (1 + df)) + 1`. Each row is
+then L2-normalised. Top terms are picked with `argpartition`, so a document
+never needs a full sort of its terms.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy/scipy are needed only for the TF-IDF stage
+    np = sparse = None
+
+
+def available() -> bool:
+    return np is not None and sparse is not None
+
+
+def _top_indices(weights: np.ndarray, terms: np.ndarray, k: int) -> np.ndarray:
+    if len(weights) > k:
+        candidates = np.argpartition(-weights, k - 1)[:k]
+    else:
+        candidates = np.arange(len(weights))
+    # Highest weight first; ties broken alphabetically so output is stable.
+    order = np.lexsort((terms[candidates], -weights[candidates]))
+    return candidates[order]
+
+
+class TfidfModel:
+    def __init__(self, term_counts: Sequence[Mapping[str, int]]) -> None:
+        if not available():
+            raise RuntimeError("TF-IDF needs the numpy and scipy packages")
+        vocabulary = sorted({term for counts in term_counts for term in counts})
+        self.terms = np.array(vocabulary, dtype=object)
+        column = {term: index for index, term in enumerate(vocabulary)}
+
+        indptr = [0]
+        indices: list[int] = []
+        data: list[int] = []
+        for counts in term_counts:
+            indices.extend(column[term] for term in counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        counts_matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(term_counts), len(vocabulary)),
+        )
+
+        documents = counts_matrix.shape[0]
+        document_frequency = np.bincount(counts_matrix.indices, minlength=len(vocabulary))
+        self.idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+
+        weights = counts_matrix.copy()
+        np.log(weights.data, out=weights.data)
+        weights.data += 1
+        weights = weights.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.matrix = sparse.diags(1 / norms) @ weights
+
+    def top_terms(self, k: int) -> list[list[str]]:
+        """The `k` highest-weighted terms of every document, in document order."""
+        matrix = self.matrix
+        top: list[list[str]] = []
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            columns = matrix.indices[start:end]
+            picked = _top_indices(matrix.data[start:end], self.terms[columns], k)
+            top.append(self.terms[columns[picked]].tolist())
+        return top
+
+    def category_term_weights(
+        self,
+        category_scores: Sequence[Mapping[str, int]],
+        categories: Sequence[str],
+        k: int,
+    ) -> dict[str, dict[str, float]]:
+        """Top `k` terms per category, weighting each document's TF-IDF row by its category score.
+
+        Weights are scaled so each category's total score sums to one.
+        """
+        scores = np.array(
+            [[row.get(category, 0) for category in categories] for row in category_scores], dtype=np.float64
+        ).reshape(len(category_scores), len(categories))  # keeps two dimensions for an empty corpus
+        totals = scores.sum(axis=0)
+        totals[totals == 0] = 1
+        weighted = np.asarray((sparse.csr_matrix(scores / totals).T @ self.matrix).todense())
+
+        result: dict[str, dict[str, float]] = {}
+        for index, category in enumerate(categories):
+            row = weighted[index]
+            nonzero = np.flatnonzero(row)
+            picked = nonzero[_top_indices(row[nonzero], self.terms[nonzero], k)]
+            result[category] = {str(self.terms[column]): round(float(row[column]), 4) for column in picked}
+        return result
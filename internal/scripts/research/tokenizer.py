@@ -0,0 +1,139 @@
+"""Keyword tokenizers: surface tokens in, normalised terms out.
+
+`normalize.tokenize` finds the surface tokens (English words and Hangul
+runs). A tokenizer maps each one to the term it is counted under:
+
+- `regex` lowercases, which is how keywords were counted before.
+- `ko-en` also strips Korean particles and verb endings ("디자인을",
+  "디자인의" -> "디자인") using the offline rule table below, and folds
+  English plurals ("components" -> "component").
+
+Articles repeat the same words constantly, so each tokenizer memoizes the
+term of every distinct surface token in a bounded LRU cache.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from normalize import MEMO_SIZE, tokenize
+
+TOKENIZERS = ("ko-en", "regex")
+
+# Particles and endings, tried longest first. A suffix is only stripped if
+# at least MIN_STEM syllables remain, which keeps "속도" and "평가" whole.
+# Particles that alternate on the final consonant (이/가, 을/를, 과/와, ...)
+# are only stripped after a matching stem, so "디스플레이" keeps its "이".
+AFTER_CONSONANT = (
+    "이", "을", "은", "과", "이나", "이랑", "이며", "이라는", "이라고",
+    "으로", "으로는", "으로도", "으로서", "으로써", "으로의", "과의", "과는",
+    "이다", "이고", "이지만", "입니다", "이에요", "이었다",
+)
+AFTER_VOWEL = (
+    "가", "를", "는", "와", "나", "랑", "라는", "라고", "와의", "와는", "예요", "였다",
+    # 로 also follows ㄹ: "모델로".
+    "로", "로는", "로도", "로서", "로써", "로의",
+)
+ANY_STEM = (
+    "의", "에", "도", "만", "에서", "에게", "한테", "께서", "까지", "부터", "처럼", "보다", "마다",
+    "에서는", "에서도", "에게는", "까지는", "부터는", "보다는", "에는", "에도", "에서의",
+    # light-verb endings on nouns
+    "하다", "하는", "하고", "하여", "해서", "했다", "한다", "하기", "하면", "하지", "한", "할", "함", "합니다", "했습니다",
+    "된다", "되는", "되고", "되어", "돼서", "됐다", "됩니다", "되었다", "된", "될",
+    "적인", "적으로",
+    # plural marker, alone or before a particle
+    "들", "들이", "들을", "들은", "들의", "들에", "들도", "들과", "들로", "들에게",
+)
+MIN_STEM = 2
+# Nouns that merely end like a particle or ending.
+KOREAN_KEEP = frozenset({"전문가", "추가", "평가", "참가", "증가", "부가", "마이크로", "매크로", "세미나", "도메인"})
+
+# English plurals that are not plurals, or whose singular would mislead.
+ENGLISH_KEEP = frozenset({"news", "series", "species", "aws", "ios", "macos", "redux", "kubernetes", "analytics", "ops"})
+ENGLISH_KEEP_ENDINGS = ("ss", "us", "is", "ics")
+
+_HANGUL_BASE = 0xAC00
+_FINAL_RIEUL = 8
+_CONSONANT, _VOWEL, _ANY = "consonant", "vowel", "any"
+_RULES = {
+    **{suffix: _ANY for suffix in ANY_STEM},
+    **{suffix: _CONSONANT for suffix in AFTER_CONSONANT},
+    **{suffix: _VOWEL for suffix in AFTER_VOWEL},
+}
+# Grouped by last character so most tokens are rejected with one dict lookup.
+_SUFFIXES_BY_LAST: dict[str, tuple[str, ...]] = {}
+for _suffix in sorted(_RULES, key=len, reverse=True):
+    _SUFFIXES_BY_LAST[_suffix[-1]] = (*_SUFFIXES_BY_LAST.get(_suffix[-1], ()), _suffix)
+
+
+def _fits(stem: str, suffix: str) -> bool:
+    rule = _RULES[suffix]
+    if rule == _ANY:
+        return True
+    final = (ord(stem[-1]) - _HANGUL_BASE) % 28
+    if rule == _CONSONANT:
+        return final != 0
+    return final == 0 or (final == _FINAL_RIEUL and suffix.startswith("로"))
+
+
+def strip_korean(token: str) -> str:
+    """Drop one particle or ending (the longest that fits and leaves a MIN_STEM-syllable stem)."""
+    if token in KOREAN_KEEP:
+        return token
+    for suffix in _SUFFIXES_BY_LAST.get(token[-1], ()):
+        if len(token) - len(suffix) >= MIN_STEM and token.endswith(suffix):
+            stem = token[: -len(suffix)]
+            if _fits(stem, suffix):
+                return stem
+    return token
+
+
+def fold_english(token: str) -> str:
+    """Lowercase, trim joiners and fold regular plurals."""
+    word = token.lower().strip("-_")
+    if len(word) <= 3 or word in ENGLISH_KEEP or not word.endswith("s") or word.endswith(ENGLISH_KEEP_ENDINGS):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "xes", "sses")):
+        return word[:-2]
+    return word[:-1]
+
+
+class RegexTokenizer:
+    name = "regex"
+
+    def __init__(self, memo_size: int = MEMO_SIZE) -> None:
+        # Bound per instance, so each tokenizer keeps its own memo.
+        self.normalize = lru_cache(maxsize=memo_size)(self._normalize)
+
+    def _normalize(self, token: str) -> str:
+        return token.lower()
+
+    def terms(self, text: str) -> list[str]:
+        normalize = self.normalize
+        return [normalize(token) for token in tokenize(text)]
+
+
+class KoreanEnglishTokenizer(RegexTokenizer):
+    name = "ko-en"
+
+    def _normalize(self, token: str) -> str:
+        # The surface regex yields either pure Hangul or an ASCII word.
+        if token[0] >= "가":
+            return strip_korean(token)
+        return fold_english(token)
+
+
+_REGISTRY = {tokenizer.name: tokenizer for tokenizer in (KoreanEnglishTokenizer, RegexTokenizer)}
+_INSTANCES: dict[str, RegexTokenizer] = {}
+
+
+def get_tokenizer(name: str = "ko-en") -> RegexTokenizer:
+    """The process-wide instance of a tokenizer, so its memo is shared by every caller."""
+    tokenizer = _INSTANCES.get(name)
+    if tokenizer is None:
+        if name not in _REGISTRY:
+            raise ValueError(f"unknown tokenizer: {name}")
+        tokenizer = _INSTANCES[name] = _REGISTRY[name]()
+    return tokenizer